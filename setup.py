@@ -47,6 +47,7 @@ setup(
     },
     python_requires='>=3.6',
     install_requires=['requests'],
+    extras_require={'asyncio': ['aiohttp']},
     entry_points={
         'console_scripts': [
             'teelebot=teelebot:main',
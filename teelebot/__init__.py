@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 """
 @creation date: 2019-08-23
-@last modification: 2023-12-08
+@last modification: 2026-10-18
 """
 import os
 import requests
@@ -11,14 +11,19 @@ from .polling import _runUpdates
 from .webhook import _runWebhook
 from .logger import _logger
 from .bot import Bot
+from .asyncbot import AsyncBot
+from .handler import _asyncio_core
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 name = "teelebot"
-__all__ = ['Bot']
+__all__ = ['Bot', 'AsyncBot']
 
-bot = Bot()
+if _asyncio_core():
+    bot = AsyncBot()
+else:
+    bot = Bot()
 VERSION = bot.version
 
 if bot._local_api_server != "False":
@@ -56,7 +61,7 @@ def main():
         url = f'{protocol}{str(bot._server_address)}:{str(bot._server_port)}/bot{str(bot._key)}'
         if (bot._drop_pending_updates == True and pending_update_count != 0) \
             or (status["url"] != url) or (status["has_custom_certificate"] != bot._self_signed) \
-            or status["max_connections"] != int(bot._pool_size) \
+            or status["max_connections"] != bot._webhook_workers \
             or allowed_updates != bot._allowed_updates:
             if bot._self_signed:
                 with open(bot._cert_pub, 'rb') as cert_pub:
@@ -64,7 +69,7 @@ def main():
                     status = bot.setWebhook(
                         url=url,
                         certificate=cert_pub_bytes,
-                        max_connections=bot._pool_size,
+                        max_connections=bot._webhook_workers,
                         allowed_updates=bot._allowed_updates,
                         drop_pending_updates=bot._drop_pending_updates,
                         secret_token=bot._secret_token
@@ -72,7 +77,7 @@ def main():
             else:
                 status = bot.setWebhook(
                     url=url,
-                    max_connections=bot._pool_size,
+                    max_connections=bot._webhook_workers,
                     allowed_updates=bot._allowed_updates,
                     drop_pending_updates=bot._drop_pending_updates,
                     secret_token=bot._secret_token
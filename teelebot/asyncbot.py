@@ -0,0 +1,203 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import asyncio
+import inspect
+import threading
+import functools
+import traceback
+
+from typing import Callable
+
+from .bot import Bot
+from .logger import _logger
+from .asyncrequest import _AsyncRequest
+
+
+def _loop_awaitable(method):
+    """
+    Make a blocking teelebot method return an awaitable on the event loop,
+    the method then runs in the executor of the loop
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.in_loop():
+            return self.loop.run_in_executor(None, functools.partial(method, self, *args, **kwargs))
+
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncBot(Bot):
+    """
+    Bot running the Bot API methods, timers and coroutine plugins on an asyncio event loop,
+    API methods are awaitables on the loop and return their result in other threads
+    """
+    getChatCreator = _loop_awaitable(Bot.getChatCreator)
+    getChatMemberStatus = _loop_awaitable(Bot.getChatMemberStatus)
+    getChatAdminsUseridList = _loop_awaitable(Bot.getChatAdminsUseridList)
+    getFileDownloadPath = _loop_awaitable(Bot.getFileDownloadPath)
+    download_file = _loop_awaitable(Bot.download_file)
+
+    def __init__(self, key: str = None, debug: bool = False, proxies: dict = None):
+        super(AsyncBot, self).__init__(key, debug, proxies)
+
+        self.async_request = _AsyncRequest(
+            int(self._pool_size) * 2, self._url, self.message_deletor,
+            self._hide_info, self._debug, self.proxies,
+            self.rate_limiter if self._rate_limit else None, self.upload_cache, self.read_cache)
+
+        self.loop = asyncio.new_event_loop()
+        self.__loop_thread = threading.Thread(
+            target=self.__run_loop, name="AsyncBotLoop", daemon=True)
+        self.__loop_thread.start()
+
+    def __del__(self):
+        try:
+            asyncio.run_coroutine_threadsafe(
+                self.async_request.close(), self.loop).result(timeout=5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        except Exception:
+            pass
+        super(AsyncBot, self).__del__()
+
+    def __run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _call_method(self, method_name, kwargs):
+        """
+        Call a Bot API method on the event loop
+        """
+        run_in_thread = kwargs.pop("run_in_thread", False) is True
+        coro = self.async_request.postEverything(method_name, **kwargs)
+        if self.in_loop():
+            return self.async_request.spawn(coro) if run_in_thread else coro
+
+        fur = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return fur if run_in_thread else fur.result()
+
+    def in_loop(self) -> bool:
+        """
+        Whether the caller runs on the event loop of the bot
+        """
+        return threading.get_ident() == self.__loop_thread.ident
+
+    def _await(self, awaitable):
+        """
+        Run an awaitable returned by a plugin function on the event loop,
+        wait for its result
+        """
+        fur = asyncio.run_coroutine_threadsafe(self.__ensure_coroutine(awaitable), self.loop)
+        return fur.result()
+
+    async def __ensure_coroutine(self, awaitable):
+        return await awaitable
+
+    def gather(self, *futures, timeout: float = None):
+        """
+        Wait for the results of calls made with run_in_thread=True,
+        on the event loop it returns an awaitable
+        """
+        if len(futures) == 1 and isinstance(futures[0], (list, tuple)):
+            futures = futures[0]
+
+        if self.in_loop():
+            return asyncio.wait_for(asyncio.gather(*futures), timeout)
+
+        return super(AsyncBot, self).gather(*futures, timeout=timeout)
+
+    def iter_file(self, file_id: str, start: int = 0):
+        """
+        Iterate over the chunks of a file from byte start on,
+        on the event loop it returns an awaitable of an async iterator
+        """
+        if self.in_loop():
+            return self.__async_iter_file(file_id, start)
+
+        return super(AsyncBot, self).iter_file(file_id, start)
+
+    async def __async_iter_file(self, file_id, start):
+        chunks = await self.loop.run_in_executor(
+            None, functools.partial(Bot.iter_file, self, file_id, start))
+        if chunks is False:
+            return False
+
+        return self.__async_chunks(chunks)
+
+    async def __async_chunks(self, chunks):
+        try:
+            while True:
+                chunk = await self.loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            chunks.close() # Give back the download slot
+
+    def message_deletor(self, time_gap: int, chat_id: str, message_id: str) -> str:
+        """
+        Timed deletion of a message, time range: [0, 900], in seconds
+        """
+        if time_gap < 0 or time_gap > 900:
+            _logger.error(f"[{chat_id}:{message_id}][{time_gap}s] Message deletion error: parameter time_gap is out of range.")
+            return "time_gap_error"
+
+        async def message_deletor_func(time_gap, chat_id, message_id):
+            if not self._hide_info:
+                _logger.info(f"[{chat_id}:{message_id}][{time_gap}s] Message deleting...")
+
+            await asyncio.sleep(int(time_gap))
+            ok = await self.async_request.postEverything(
+                "deleteMessage", chat_id=chat_id, message_id=message_id)
+
+            if ok:
+                if not self._hide_info:
+                    _logger.info(f"[{chat_id}:{message_id}][{time_gap}s] Message deleted.")
+            else:
+                _logger.error(f"[{chat_id}:{message_id}][{time_gap}s] Message deletion error.")
+
+        self.__schedule(message_deletor_func(time_gap, chat_id, message_id))
+
+        return "ok"
+
+    def timer(self, time_gap: int, func: Callable[..., None], *args: tuple) -> str:
+        """
+        Single timer, time range: [0, 900], unit seconds,
+        coroutine functions run on the event loop and other functions in a thread
+        """
+        if time_gap < 0 or time_gap > 900:
+            return "time_gap_error"
+
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+
+        async def timer_func(time_gap, func, *args):
+            if not self._hide_info:
+                _logger.info(f"[{id(timer_func)}][{time_gap}s] Timer executing...")
+
+            await asyncio.sleep(int(time_gap))
+            try:
+                if inspect.iscoroutinefunction(func):
+                    await func(*args)
+                else:
+                    await self.loop.run_in_executor(None, functools.partial(func, *args))
+
+                if not self._hide_info:
+                    _logger.info(f"[{id(timer_func)}][{time_gap}s] Timer executed.")
+            except Exception as e:
+                _logger.error(f"[{id(timer_func)}][{time_gap}s] Timer execution error: {e}")
+                traceback.print_exc()
+
+        self.__schedule(timer_func(time_gap, func, *args))
+
+        return "ok"
+
+    def __schedule(self, coro):
+        if self.in_loop():
+            return asyncio.ensure_future(coro)
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
@@ -0,0 +1,224 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import io
+import json
+import mmap
+import asyncio
+import traceback
+
+from pathlib import Path
+
+from .logger import _logger
+from .multipart import _MultipartEncoder
+from .common import (
+    __rate_limited_method_prefixes__,
+    __rate_limit_exempt_methods__,
+    __rate_limit_max_retries__,
+    __upload_chunk_size__
+    )
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class _AsyncRequest(object):
+    """
+    Async Request Class
+    """
+    def __init__(self, connections, url, message_deletor, hide_info, debug=False, proxies={"all": None},
+                 rate_limiter=None, upload_cache=None, read_cache=None):
+        if aiohttp is None:
+            raise ImportError("The asyncio core requires aiohttp, install it with: pip install aiohttp")
+
+        self.__url = url
+        self.__message_deletor = message_deletor
+        self.__hide_info = hide_info
+        self.__debug = debug
+        self.__connections = connections
+        self.__rate_limiter = rate_limiter
+        self.__upload_cache = upload_cache
+        self.__read_cache = read_cache
+        self.__session = None
+        self.__tasks = set() # Keep run_in_thread calls alive until they are done
+
+        self.__proxy = None
+        for scheme in ["https", "all", "http"]:
+            proxy = (proxies or {}).get(scheme)
+            if proxy not in [None, "", " "]:
+                if not str(proxy).startswith("http"):
+                    _logger.warn(f"The asyncio core only supports http proxies, ignore proxy {proxy}.")
+                else:
+                    self.__proxy = proxy
+                break
+
+    async def close(self):
+        """
+        Close the connection pool
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def __connection_session(self):
+        """
+        Connection Pool, created lazily on the running event loop
+        """
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.__connections, ssl=False)
+            self.__session = aiohttp.ClientSession(connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30))
+
+        return self.__session
+
+    def __debug_info(self, method_name, result):
+        """
+        Debug mode
+        """
+        if self.__debug and not result.get("ok"):
+            _logger.error(
+                "Request failed" + " - " + \
+                "Method:" + method_name + " - " + \
+                "Result:" + str(result))
+
+    async def postEverything(self, method_name, **kwargs):
+
+        inputmedia_methods = ["sendMediaGroup", "editMessageMedia"]
+        is_inputmedia = False
+        inputmedia_param_name = "files"
+        if method_name in inputmedia_methods:
+            is_inputmedia = True
+
+        run_in_thread = False
+        run_in_thread_param_name = "run_in_thread"
+        if run_in_thread_param_name in list(kwargs.keys()):
+            value = kwargs.pop(run_in_thread_param_name, False)
+            if isinstance(value, bool):
+                run_in_thread = value
+
+        del_msg_after = -1
+        del_msg_after_param_name = "del_msg_after"
+        if del_msg_after_param_name in list(kwargs.keys()):
+            value = kwargs.pop(del_msg_after_param_name, False)
+            if isinstance(value, int):
+                del_msg_after = value
+
+        data, files = {}, {}
+        for key, value in kwargs.items():
+            if value is None:
+                pass
+            elif not is_inputmedia and key == inputmedia_param_name:
+                pass
+            elif is_inputmedia and key == inputmedia_param_name:
+                files = value
+            elif isinstance(value, (tuple, bytes, io.IOBase, mmap.mmap, Path)): # Streamed from files
+                files[key] = value
+            elif isinstance(value, (dict, list)):
+                data[key] = json.dumps(value)
+            else:
+                data[key] = str(value)
+
+        url = f'{self.__url}{method_name}'
+        if self.__read_cache is not None and not run_in_thread and self.__read_cache.cacheable(method_name):
+            return await self.__read_cache.aload(method_name, data,
+                lambda: self.__requestFunc(method_name, url, data, files, del_msg_after))
+        if run_in_thread:
+            return self.spawn(
+                self.__requestFunc(method_name, url, data, files, del_msg_after))
+
+        return await self.__requestFunc(method_name, url, data, files, del_msg_after)
+
+    def spawn(self, coro):
+        """
+        Run a request in the background on the running event loop, return its task
+        """
+        task = asyncio.ensure_future(coro)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+        return task
+
+    async def __stream(self, body):
+        """
+        Multipart body read in a thread, one chunk at a time
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, body.read, __upload_chunk_size__)
+            if not chunk:
+                break
+            yield chunk
+
+    async def __requestFunc(self, method_name, url, data, files, del_msg_after):
+        rate_limited = self.__rate_limiter is not None \
+            and method_name.startswith(__rate_limited_method_prefixes__) \
+            and method_name not in __rate_limit_exempt_methods__
+        body, headers, pending = None, None, {}
+        try:
+            session = self.__connection_session()
+            if self.__upload_cache is not None and files:
+                pending = self.__upload_cache.substitute(method_name, data, files)
+
+            for retries in range(__rate_limit_max_retries__ + 1):
+                if rate_limited:
+                    delay = self.__rate_limiter.reserve(data.get("chat_id"))
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if files:
+                    if body is None:
+                        body = _MultipartEncoder(data, files)
+                        headers = {"Content-Type": body.content_type}
+                        if body.length is not None:
+                            headers["Content-Length"] = str(body.length)
+                    body.seek(0)
+                async with session.post(url, data=self.__stream(body) if files else data,
+                                        headers=headers if files else None, proxy=self.__proxy) as req:
+                    response = await req.json(content_type=None)
+
+                if rate_limited and response.get("error_code") == 429 \
+                    and retries < __rate_limit_max_retries__:
+                    retry_after = response.get("parameters", {}).get("retry_after", 1)
+                    if not self.__hide_info:
+                        _logger.warn(f"Method {method_name} is rate limited: retry after {retry_after}s.")
+                    self.__rate_limiter.penalize(data.get("chat_id"), retry_after)
+                    continue
+
+                if not response.get("ok", False) and pending and retries < __rate_limit_max_retries__ \
+                    and self.__upload_cache.forget(pending, data, files):
+                    continue # A cached file_id is rejected, upload the files again
+
+                self.__debug_info(method_name, response)
+                if response.get("ok", False):
+                    result = response.get("result")
+                    if pending:
+                        self.__upload_cache.learn(pending, result)
+                    if self.__read_cache is not None:
+                        self.__read_cache.written(method_name, data)
+
+                    if del_msg_after >= 0:
+                        if isinstance(result, dict) \
+                            and "chat" in result.keys() \
+                            and "id" in result.get("chat").keys() \
+                            and "message_id" in result.keys():
+
+                            self.__message_deletor(
+                                time_gap=del_msg_after,
+                                chat_id=result.get("chat").get("id"),
+                                message_id=result.get("message_id")
+                            )
+
+                    return result
+                else:
+                    return response.get("ok")
+        except Exception as e:
+            _logger.error(f"Error executing method {method_name}: {str(e)}")
+            traceback.print_exc()
+            return False
+        finally:
+            if isinstance(body, _MultipartEncoder):
+                body.close()
@@ -2,14 +2,13 @@
 """
 @description: A Python-based Telegram Bot framework
 @creation date: 2019-08-13
-@last modification: 2024-05-16
+@last modification: 2026-10-18
 @author: Pluto (github:plutobell)
 """
 import time
 import sys
 import os
 import copy
-import types
 import string
 import random
 import shutil
@@ -23,16 +22,37 @@ from pathlib import Path
 from typing import Union, Callable
 from concurrent.futures import ThreadPoolExecutor, Future
 
-from .handler import _config, _bridge, _plugin_info
+from .handler import _config
 from .logger import _logger
 from .schedule import _Schedule
 from .buffer import _Buffer
 from .request import _Request
 from .metadata import _Metadata
+from .registry import _PluginRegistry
+from .router import _Router
+from .pluginctl import _PluginCTL
+from .dispatcher import _Dispatcher
+from .polling import _Poller
+from .ratelimit import _RateLimiter
+from .download import _Downloader
+from .uploadcache import _UploadCache
+from .readcache import _ReadCache
+from .methods import __api_methods__, __framework_params__
 from .common import (
+    __download_max_concurrency__,
     __plugin_init_func_name__,
+    __plugin_batch_func_suffix__,
+    __dispatch_priorities__,
+    __dispatch_default_priority__,
     __plugin_control_plugin_name__,
-    __plugin_control_plugin_command__
+    __plugin_control_plugin_command__,
+    __plugin_control_cache_size__,
+    __update_type_priorities__,
+    __read_cache_invalidating_fields__,
+    __message_type_table__,
+    __message_type_fields__,
+    __message_type_unknown__,
+    __message_shape_cache_size__
     )
 
 
@@ -74,6 +94,7 @@ class Bot(object):
             self._server_port = config["server_port"]
             self._local_address = config["local_address"]
             self._local_port = config["local_port"]
+            self._webhook_workers = config["webhook_workers"]
             if "secret_token" in list(config.keys()):
                 if config["secret_token"] not in [None, "", " "]:
                     self._secret_token = config["secret_token"]
@@ -82,7 +103,7 @@ class Bot(object):
             else:
                 self._secret_token = self.__make_token()
         self._offset = 0
-        self._timeout = 0
+        self._timeout = config["polling_timeout"]
         self._pool_size = config["pool_size"]
         self._buffer_size = config["buffer_size"]
         self._drop_pending_updates = config["drop_pending_updates"]
@@ -130,15 +151,40 @@ class Bot(object):
         schedule_queue_size = round(int(self._pool_size) - thread_pool_size)
         if schedule_queue_size == 0: schedule_queue_size = int(self._pool_size)
 
+        self.rate_limiter = _RateLimiter()
+        self.upload_cache = None
+        if config["upload_cache"] > 0:
+            self.upload_cache = _UploadCache(str(Path(
+                f'{config["upload_cache_dir"]}/upload_cache_{self._key.split(":")[0]}.json')),
+                config["upload_cache"])
+        self.read_cache = _ReadCache(config["read_cache"]) if config["read_cache"] > 0 else None
         self.request = _Request(
-            thread_pool_size, self._url, self.message_deletor, config["hide_info"], self._debug, self.__proxies)
+            thread_pool_size, self._url, self.message_deletor, config["hide_info"], self._debug, self.__proxies,
+            self.rate_limiter if config["rate_limit"] else None, self.upload_cache, self.read_cache)
+        self.downloader = _Downloader(self.request, __download_max_concurrency__)
         self.schedule = _Schedule(schedule_queue_size)
         self.buffer = _Buffer(int(self._buffer_size) * 1024 * 1024,
             self.__plugin_bridge.keys(), self.__plugin_dir)
+        self.__buffer_full = False
         self.metadata = _Metadata(self.__plugin_dir)
-
-        self.__thread_pool = ThreadPoolExecutor(
-            max_workers=thread_pool_size)
+        self.__plugin_registry = _PluginRegistry(self.__plugin_dir, self.__VERSION,
+            self.__plugin_bridge, self.__non_plugin_list,
+            config["plugin_info"], config["non_plugin_info"], config["plugin_debounce"])
+        self.__plugin_generation = self.__plugin_registry.generation
+        self.__plugin_reload_mutex = threading.RLock()
+        self.__batch_entrances = {}
+        self.__plugin_registry.start()
+        self.router = _Router()
+        self.pluginctl = _PluginCTL(self.__plugin_dir,
+            __plugin_control_cache_size__, config["plugin_debounce"])
+        self.__compile_router()
+
+        self.__thread_pool = ThreadPoolExecutor( # Priority lanes have their own workers
+            max_workers=thread_pool_size + sum(config["dispatch_lanes"].values()))
+        self.dispatcher = _Dispatcher(self.__thread_pool, config["dispatch_mode"],
+            config["dispatch_chat_queue_size"], config["dispatch_chat_policy"],
+            config["dispatch_queue_size"], config["dispatch_policy"], config["dispatch_lanes"])
+        self.poller = _Poller(self, config["polling_timeout"])
         self.__timer_thread_pool = ThreadPoolExecutor(
             max_workers=int(self._pool_size) * 5)
         plugin_init_pool_size = int(self._pool_size)
@@ -147,11 +193,23 @@ class Bot(object):
         self.__plugin_init_pool = ThreadPoolExecutor(
             max_workers=plugin_init_pool_size)
 
-        self.__plugin_info = config["plugin_info"]
-        self.__non_plugin_info = config["non_plugin_info"]
+        self.__plugin_info = dict(config["plugin_info"])
+        self.__non_plugin_info = dict(config["non_plugin_info"])
 
-        self.__method_name = ""
         self.__hide_info = config["hide_info"]
+        self._hide_info = config["hide_info"]
+        self._rate_limit = config["rate_limit"]
+
+        self.__update_normalizers = {
+            "inline_query": self.__normalize_inline_query,
+            "callback_query": self.__normalize_callback_query,
+            "my_chat_member": self.__normalize_chat_member("my_chat_member_id"),
+            "chat_member": self.__normalize_chat_member("chat_member_id"),
+            "chat_join_request": self.__normalize_chat_member("chat_join_request_id"),
+            "edited_message": self.__normalize_message,
+            "message": self.__normalize_message
+        }
+        self.__message_shapes = {} # keys of a message -> entry of the message type table
 
         self.__plugins_init_status_mutex = threading.RLock()
         self.__plugins_init_status = {}
@@ -167,24 +225,42 @@ class Bot(object):
         self.__timer_thread_pool.shutdown(wait=True)
         self.__plugin_init_pool.shutdown(wait=True)
         del self.request
+        del self.rate_limiter
+        del self.downloader
+        del self.upload_cache
+        del self.read_cache
         del self.schedule
         del self.buffer
         del self.metadata
+        del self.__plugin_registry
+        del self.router
+        del self.pluginctl
+        del self.dispatcher
+        del self.poller
         del self.__plugins_init_status
         del self.__plugin_init_furs
 
     def __getattr__(self, method_name):
-        self.__method_name = method_name
-        
-        return types.MethodType(self.__method_function, self)
+        """
+        Fallback of the Bot API methods missing from the method table
+        """
+        if method_name.startswith("_"):
+            raise AttributeError(method_name)
+
+        return functools.partial(self.__method_function, method_name)
 
-    def __method_function(self, *args, **kwargs):
-        # command = inspect.stack()[0].function
-        if len(args) != 1:
-            _logger.error(f"Method '{self.__method_name}' does not accept positional arguments")
+    def __method_function(self, method_name, *args, **kwargs):
+        if len(args) != 0:
+            _logger.error(f"Method '{method_name}' does not accept positional arguments")
             raise MethodPositionalArgumentError("Method does not accept positional arguments")
 
-        return self.request.postEverything(self.__method_name, **kwargs)
+        return self._call_method(method_name, kwargs)
+
+    def _call_method(self, method_name, kwargs):
+        """
+        Call a Bot API method
+        """
+        return self.request.postEverything(method_name, **kwargs)
 
     def __threadpool_exception(self, fur):
         """
@@ -231,7 +307,7 @@ class Bot(object):
                         if not self.__hide_info:
                             _logger.info(f"Delay initialize {plugin} plugin: until a thread pool slot is available.")
 
-                    fur = self.__plugin_init_pool.submit(pluginInitFunc, bot)
+                    fur = self.__plugin_init_pool.submit(self._run_plugin_func, pluginInitFunc, (bot,))
                     callback_with_args = functools.partial(__threadpool_exception, plugin_name=plugin, status=True)
                     fur.add_done_callback(callback_with_args)
 
@@ -379,114 +455,89 @@ class Bot(object):
 
             self.__non_plugin_list = now_non_plugin_list
 
+    def __reload_plugins(self):
+        """
+        Apply the latest generation of the plugin registry
+        """
+        with self.__plugin_reload_mutex:
+            generation, now_plugin_bridge, now_non_plugin_list, \
+                now_plugin_info, now_non_plugin_info = self.__plugin_registry.snapshot()
+            if generation == self.__plugin_generation:
+                return
+
+            if now_plugin_bridge != self.__plugin_bridge: # Dynamic Loading Plugin
+                self.__load_plugin(now_plugin_info=now_plugin_info, now_plugin_bridge=now_plugin_bridge)
+            if len(now_plugin_info) != len(self.__plugin_info) or \
+                now_plugin_info != self.__plugin_info: # Dynamically update plugin information
+                for plugin_name in list(self.__plugin_bridge.keys()):
+                    self.__update_plugin(plugin_name) # Hot Update Plugin
+
+            if now_non_plugin_list != self.__non_plugin_list: # Dynamically loading non-plugin packages
+                self.__load_plugin(now_plugin_info=now_non_plugin_info, as_plugin=False,
+                    now_non_plugin_list=now_non_plugin_list)
+            if len(now_non_plugin_info) != len(self.__non_plugin_info) or \
+                now_non_plugin_info != self.__non_plugin_info: # Dynamic update  the information of non-plugin package
+                for plugin_name in list(self.__non_plugin_list):
+                    self.__update_plugin(plugin_name, as_plugin=False) # Hot update non-plugin package
+
+            self.__compile_router() # Recompile command router
+            self.__batch_entrances = {}
+            self.__plugin_generation = generation
+
+    def __compile_router(self):
+        """
+        Compile the commands of the runnable plugins into the router,
+        plugins incompatible with this teelebot are left out
+        """
+        routes = {}
+        for plugin, command in self.__plugin_bridge.items():
+            ok, reason = self.__plugin_registry.compatible(plugin)
+            if ok:
+                routes[plugin] = command
+            else:
+                _logger.warn(f"Skip run {plugin} plugin: {reason}")
+
+        self.router.compile(routes)
+
     def __control_plugin(self, plugin_bridge, chat_type, chat_id):
+        """
+        Get the plugins disabled in the chat by PluginCTL
+        """
         control_plugin = __plugin_control_plugin_name__
         control_plugin_command = __plugin_control_plugin_command__
 
-        if chat_type != "private" and control_plugin in plugin_bridge.keys() \
-                and plugin_bridge[control_plugin] == control_plugin_command:
-            if os.path.exists(self.path_converter(f'{self.__plugin_dir}{control_plugin}/db/{str(chat_id)}.db')):
-                with open(self.path_converter(f'{self.__plugin_dir}{control_plugin}/db/{str(chat_id)}.db'), "r") as f:
-                    plugin_setting = f.read().strip()
-                plugin_list_off = plugin_setting.split(',')
-                plugin_bridge_temp = {}
-                for plugin in list(plugin_bridge.keys()):
-                    if plugin not in plugin_list_off:
-                        plugin_bridge_temp[plugin] = plugin_bridge[plugin]
-                plugin_bridge = plugin_bridge_temp
+        if chat_type != "private" and \
+            plugin_bridge.get(control_plugin) == control_plugin_command:
+            return self.pluginctl._disabled(chat_id)
 
-        return plugin_bridge
+        return frozenset()
 
     def __mark_message_for_pluginRun(self, message):
-        if "callback_query_id" in message.keys():  # callback query
-            message["message_type"] = "callback_query_data"
-            message_type = "callback_query_data"
-        elif "query" in message.keys():
-            message["message_type"] = "inline_query"
-            message_type = "query"
-        elif "voice_chat_started" in message.keys():
-            message["message_type"] = "voice_started"
-            message_type = "voice_started"
-            message["voice_started"] = ""
-        elif "voice_chat_ended" in message.keys():
-            message["message_type"] = "voice_ended"
-            message_type = "voice_ended"
-            message["voice_ended"] = ""
-        elif "voice_chat_participants_invited" in message.keys():
-            message["message_type"] = "voice_invited"
-            message_type = "voice_invited"
-            message["voice_invited"] = ""
-        elif "message_auto_delete_timer_changed" in message.keys():
-            message["message_type"] = "message__timer_changed"
-            message_type = "message__timer_changed"
-            message["message__timer_changed"] = ""
-        elif "my_chat_member_id" in message.keys():
-            message["message_type"] = "my_chat_member_data"
-            message_type = "my_chat_member_data"
-            message["my_chat_member_data"] = ""
-        elif "chat_member_id" in message.keys():
-            message["message_type"] = "chat_member_data"
-            message_type = "chat_member_data"
-            message["chat_member_data"] = ""
-        elif "chat_join_request_id" in message.keys():
-            message["message_type"] = "chat_join_request_data"
-            message_type = "chat_join_request_data"
-            message["chat_join_request_data"] = ""
-        elif "new_chat_members" in message.keys():
-            message["message_type"] = "chat_members"
-            message_type = "chat_members"
-            message["chat_members"] = ""  # default prefix of command
-        elif "left_chat_member" in message.keys():
-            message["message_type"] = "left_member"
-            message_type = "left_member"
-            message["left_member"] = ""
-        elif "photo" in message.keys():
-            message["message_type"] = "photo"
-            message_type = "message_type"
-        elif "sticker" in message.keys():
-            message["message_type"] = "sticker"
-            message_type = "message_type"
-        elif "video" in message.keys():
-            message["message_type"] = "video"
-            message_type = "message_type"
-        elif "audio" in message.keys():
-            message["message_type"] = "audio"
-            message_type = "message_type"
-        elif "document" in message.keys():
-            message["message_type"] = "document"
-            message_type = "message_type"
-        elif "contact" in message.keys():
-            message["message_type"] = "contact"
-            message_type = "message_type"
-        elif "dice" in message.keys():
-            message["message_type"] = "dice"
-            message_type = "message_type"
-        elif "game" in message.keys():
-            message["message_type"] = "game"
-            message_type = "message_type"
-        elif "poll" in message.keys():
-            message["message_type"] = "poll"
-            message_type = "message_type"
-        elif "venue" in message.keys():
-            message["message_type"] = "venue"
-            message_type = "message_type"
-        elif "location" in message.keys():
-            message["message_type"] = "location"
-            message_type = "message_type"
-        elif "invoice" in message.keys():
-            message["message_type"] = "invoice"
-            message_type = "message_type"
-        elif "text" in message.keys():
-            message["message_type"] = "text"
-            message_type = "text"
-        elif "caption" in message.keys():
-            message["message_type"] = "caption"
-            message_type = "caption"
-        else:
-            message["message_type"] = "unknown"
-            message_type = "unknown"
-
-        return message_type, message
+        """
+        Tag the message with its message_type,
+        return the field matched with plugin commands
+        """
+        message_type = message.get("message_type")
+        if message_type in __message_type_fields__:
+            return __message_type_fields__[message_type], message
+
+        shape = tuple(message.keys()) # Messages of a kind share their keys
+        item = self.__message_shapes.get(shape)
+        if item is None:
+            item = __message_type_unknown__
+            for key in shape:
+                entry = __message_type_table__.get(key)
+                if entry is not None and entry < item:
+                    item = entry
+            if len(self.__message_shapes) < __message_shape_cache_size__:
+                self.__message_shapes[shape] = item
+
+        _, message_type, field, placeholder = item
+        message["message_type"] = message_type
+        if placeholder is not None:
+            message[field] = placeholder # default prefix of command
+
+        return field, message
 
     def __logging_for_pluginRun(self, message, plugin, update_id):
         title = ""  # INFO Log
@@ -558,25 +609,20 @@ class Bot(object):
         if message is None:
             return
 
-        try:
-            now_plugin_bridge, now_non_plugin_list = _bridge(self.__plugin_dir)
-            now_plugin_info = _plugin_info(now_plugin_bridge.keys(), self.__plugin_dir)
-            now_non_plugin_info = _plugin_info(now_non_plugin_list, self.__plugin_dir)
+        self._pluginRunBatch(bot, [message])
 
-            if now_plugin_bridge != self.__plugin_bridge: # Dynamic Loading Plugin
-                self.__load_plugin(now_plugin_info=now_plugin_info, now_plugin_bridge=now_plugin_bridge)
-            if len(now_plugin_info) != len(self.__plugin_info) or \
-                now_plugin_info != self.__plugin_info: # Dynamically update plugin information
-                for plugin_name in list(self.__plugin_bridge.keys()):
-                    self.__update_plugin(plugin_name) # Hot Update Plugin
+    def _pluginRunBatch(self, bot, messages):
+        """
+        Run plugins for a page of messages,
+        plugins with a batch entrance receive all their messages of the page at once
+        """
+        messages = [message for message in messages if message is not None]
+        if len(messages) == 0:
+            return
 
-            if now_non_plugin_list != self.__non_plugin_list: # Dynamically loading non-plugin packages
-                self.__load_plugin(now_plugin_info=now_non_plugin_info, as_plugin=False,
-                    now_non_plugin_list=now_non_plugin_list)
-            if len(now_non_plugin_info) != len(self.__non_plugin_info) or \
-                now_non_plugin_info != self.__non_plugin_info: # Dynamic update  the information of non-plugin package
-                for plugin_name in list(self.__non_plugin_list):
-                    self.__update_plugin(plugin_name, as_plugin=False) # Hot update non-plugin package
+        try:
+            if self.__plugin_registry.generation != self.__plugin_generation:
+                self.__reload_plugins() # The plugin dir has changed
 
             if len(self.__plugin_bridge) == 0:
                 os.system("")
@@ -585,78 +631,150 @@ class Bot(object):
             self._update_plugins_init_status() # Update plugins init status
             self._plugins_init(bot)
 
-            ok, buffer_status = self.buffer.status() # Buffer capacity monitoring
-            if ok and buffer_status["used"] >= buffer_status["size"]:
+            ok, buffer_status = self.buffer.status() # Buffer capacity monitoring, expired data is reclaimed
+            buffer_full = ok and buffer_status["used"] >= buffer_status["size"]
+            if buffer_full and not self.__buffer_full: # Warn once until the buffer has room again
                 os.system("")
                 _logger.warn("\033[1;31mThe data buffer area is full \033[0m")
-
-            plugin_bridge = self.__control_plugin( # pluginctl control
-                self.__plugin_bridge, message["chat"]["type"], message["chat"]["id"])
-
-            message_type = ""
-            message_type, message = self.__mark_message_for_pluginRun(message) # Category tagging messages
-
-            if message_type == "unknown":
-                self.__logging_for_pluginRun(message, "unknown", message["update_id"])
-                return
+            self.__buffer_full = buffer_full
 
         except Exception as e:
-            _logger.error(f"[{message['update_id']}] Run plugin error: {e}")
+            _logger.error(f"[{messages[0]['update_id']}] Run plugin error: {e}")
             traceback.print_exc()
             return
 
-        for plugin, command in plugin_bridge.items():
+        batches = {}
+        for message in messages:
             try:
-                if message_type == "query":
-                    if command in ["", " ", None]:
+                disabled_plugins = self.__control_plugin( # pluginctl control
+                    self.__plugin_bridge, message["chat"]["type"], message["chat"]["id"])
+
+                message_type = ""
+                message_type, message = self.__mark_message_for_pluginRun(message) # Category tagging messages
+
+                if message_type == "unknown":
+                    self.__logging_for_pluginRun(message, "unknown", message["update_id"])
+                    continue
+
+            except Exception as e:
+                _logger.error(f"[{message['update_id']}] Run plugin error: {e}")
+                traceback.print_exc()
+                continue
+
+            matched_plugins = self.router.match( # Match commands
+                message.get(message_type), skip_blank=(message_type == "query"))
+            priority = self.__dispatch_priority(message, message_type)
+            lane = message["message_type"]
+            if lane not in self.dispatcher.lanes:
+                lane = "default"
+            for plugin in matched_plugins:
+                try:
+                    if plugin in disabled_plugins:
                         continue
 
-                if message.get(message_type)[:len(command)] == command:
-                    plugin_requires_version = ""
-                    ok, data = self.metadata.read(plugin_name=plugin)
-                    if ok:
-                        plugin_requires_version = data.get("Requires-teelebot", {})
-                        plugin_requires_version = plugin_requires_version.replace(">", "").replace("<", "").replace("=", "")
-                        if plugin_requires_version in [None, "", " "]:
-                            _logger.warn(f"[{message['update_id']}] Skip run {plugin} plugin: failed to get the version of the plugin")
-                            continue
+                    chat_key = None
+                    if self.dispatcher.mode == "chat":
+                        chat_key = message["chat"]["id"]
+
+                    if self.__batch_entrance(plugin) is not None:
+                        batch = batches.setdefault((plugin, chat_key, lane), [priority, []])
+                        batch[0] = max(batch[0], priority)
+                        batch[1].append(message)
                     else:
-                        _logger.warn(f"[{message['update_id']}] Skip run {plugin} plugin: failed to get information about the plugin (error: {data})")
-                        continue
-                    if plugin_requires_version > self.version:
-                        _logger.warn(f"[{message['update_id']}] Skip run {plugin} plugin: the plugin requires teelebot version >= {plugin_requires_version}")
-                        continue
+                        if self.dispatcher.busy(lane):
+                            if not self.__hide_info:
+                                _logger.info(f"[{message['update_id']}] Delay run {plugin} plugin: until a thread pool slot is available.")
+
+                        def pluginFuncWrap(bot, message, plugin):
+                            module = self.__import_module(plugin)
+                            pluginFunc = getattr(module, plugin)
+                            self.__logging_for_pluginRun(message, plugin, message["update_id"])
+                            self._run_plugin_func(pluginFunc, (bot, message))
+                        if not self.dispatcher.submit(pluginFuncWrap, bot, message, plugin,
+                            key=chat_key, merge_key=plugin, priority=priority, lane=lane):
+                            if not self.__hide_info:
+                                _logger.warn(f"[{message['update_id']}] Drop run {plugin} plugin: the dispatch queue is full.")
+                            continue
 
-                    no_plugin_path = f'{self.__plugin_dir}{plugin}.py'
-                    if os.path.exists(no_plugin_path):
-                        _logger.warn(f"[{message['update_id']}] Skip run {plugin} plugin: there is a module named '{plugin}.py' under the plugin dir with the same name as plugin {plugin} ({no_plugin_path})")
-                        continue
+                    self.__count_response(message)
 
-                    if self.__thread_pool._work_queue.qsize() >= self.__thread_pool._max_workers:
-                        if not self.__hide_info:
-                            _logger.info(f"[{message['update_id']}] Delay run {plugin} plugin: until a thread pool slot is available.")
+                except Exception as e:
+                    _logger.error(f"[{message['update_id']}] Run {plugin} plugin error: {e}")
+                    traceback.print_exc()
 
-                    def pluginFuncWrap(bot, message, plugin):
-                        module = self.__import_module(plugin)
-                        pluginFunc = getattr(module, plugin)
-                        self.__logging_for_pluginRun(message, plugin, message["update_id"])
-                        pluginFunc(bot, message)
-                    fur = self.__thread_pool.submit(pluginFuncWrap, bot, message, plugin)
-                    fur.add_done_callback(self.__threadpool_exception)
-            
-                    self.__response_times += 1
+        for (plugin, chat_key, lane), (priority, plugin_messages) in batches.items():
+            try:
+                if self.dispatcher.busy(lane):
+                    if not self.__hide_info:
+                        _logger.info(f"[{plugin_messages[0]['update_id']}] Delay run {plugin} plugin: until a thread pool slot is available.")
 
-                    if message["chat"]["type"] != "private" and \
-                    message["chat"]["id"] not in self.__response_chats:
-                        self.__response_chats.append(message["chat"]["id"])
-                    if message["from"]["id"] not in self.__response_users:
-                        if not message["from"]["is_bot"]:
-                            self.__response_users.append(message["from"]["id"])
+                def pluginBatchFuncWrap(bot, messages, plugin):
+                    pluginBatchFunc = self.__batch_entrance(plugin)
+                    for message in messages:
+                        self.__logging_for_pluginRun(message, plugin, message["update_id"])
+                    self._run_plugin_func(pluginBatchFunc, (bot, messages))
+                if not self.dispatcher.submit(pluginBatchFuncWrap, bot, plugin_messages, plugin,
+                    key=chat_key, merge_key=plugin, priority=priority, lane=lane):
+                    if not self.__hide_info:
+                        _logger.warn(f"[{plugin_messages[0]['update_id']}] Drop run {plugin} plugin: the dispatch queue is full.")
 
             except Exception as e:
-                _logger.error(f"[{message['update_id']}] Run {plugin} plugin error: {e}")
+                _logger.error(f"[{plugin_messages[0]['update_id']}] Run {plugin} plugin error: {e}")
                 traceback.print_exc()
 
+    def _run_plugin_func(self, func, args):
+        """
+        Call a plugin function, coroutine plugin functions need the asyncio core,
+        the call returns when the coroutine has finished, so that the dispatch
+        slot and the order of the chat are held until then
+        """
+        result = func(*args)
+        if inspect.isawaitable(result):
+            return self._await(result)
+
+        return result
+
+    def _await(self, awaitable):
+        """
+        Run an awaitable returned by a plugin function
+        """
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        _logger.error("Coroutine plugin functions need the asyncio core, run teelebot with --asyncio.")
+
+        return False
+
+    def __batch_entrance(self, plugin):
+        """
+        Get the batch entrance function of the plugin, None if it has none
+        """
+        if plugin not in self.__batch_entrances:
+            module = self.__import_module(plugin)
+            self.__batch_entrances[plugin] = getattr(
+                module, f"{plugin}{__plugin_batch_func_suffix__}", None)
+
+        return self.__batch_entrances[plugin]
+
+    def __dispatch_priority(self, message, message_type):
+        """
+        Get the dispatch priority of the message, commands are kept longest
+        """
+        text = message.get(message_type)
+        if message_type in ["text", "caption"] and isinstance(text, str) and text.startswith("/"):
+            return __dispatch_priorities__["command"]
+
+        return __dispatch_priorities__.get(message.get("message_type"), __dispatch_default_priority__)
+
+    def __count_response(self, message):
+        self.__response_times += 1
+
+        if message["chat"]["type"] != "private" and \
+        message["chat"]["id"] not in self.__response_chats:
+            self.__response_chats.append(message["chat"]["id"])
+        if message["from"]["id"] not in self.__response_users:
+            if not message["from"]["is_bot"]:
+                self.__response_users.append(message["from"]["id"])
+
     def _washUpdates(self, results):
         """
         Cleaning the message queue,
@@ -671,74 +789,94 @@ class Bot(object):
         for result in results:
             if "update_id" not in result.keys():
                 return None
-            update_ids.append(result.get("update_id"))
+            update_id = result["update_id"]
+            update_ids.append(update_id)
+
             query_or_message = ""
-            if result.get("inline_query"):
-                query_or_message = "inline_query"
-            elif result.get("callback_query"):
-                query_or_message = "callback_query"
-            elif result.get("my_chat_member"):
-                query_or_message = "my_chat_member"
-            elif result.get("chat_member"):
-                query_or_message = "chat_member"
-            elif result.get("chat_join_request"):
-                query_or_message = "chat_join_request"
-            elif result.get("edited_message"):
-                query_or_message = "edited_message"
-            elif result.get("message"):
-                query_or_message = "message"
-
-            if query_or_message == "inline_query":
-                inline_query = result.get(query_or_message)
-                inline_query["update_id"] = result["update_id"]
-                inline_query["message_id"] = result["update_id"]
-                inline_query["chat"] = inline_query.get("from")
-                inline_query["chat"].pop("language_code")
-                inline_query["chat"].pop("is_bot")
-                inline_query["chat"]["type"] = "private"
-                inline_query["text"] = ""
-                inline_query["query"] = f'{self.__inline_mode_prefix}{inline_query["query"]}' # Inline Mode Plugin Prefix
-                messages.append(inline_query)
-            elif query_or_message == "callback_query":
-                callback_query = result.get(query_or_message).get("message")
-                callback_query["update_id"] = result["update_id"]
-                callback_query["click_user"] = result.get(query_or_message)[
-                    "from"]
-                callback_query["callback_query_id"] = result.get(
-                    query_or_message).get("id")
-                callback_query["callback_query_data"] = result.get(
-                    query_or_message).get("data")
-                messages.append(callback_query)
-            elif query_or_message == "my_chat_member":
-                my_chat_member = result.get(query_or_message)
-                my_chat_member["update_id"] = result["update_id"]
-                my_chat_member["message_id"] = result.get("update_id")
-                my_chat_member["my_chat_member_id"] = result.get("update_id")
-                messages.append(my_chat_member)
-            elif query_or_message == "chat_member":
-                chat_member = result.get(query_or_message)
-                chat_member["update_id"] = result["update_id"]
-                chat_member["message_id"] = result.get("update_id")
-                chat_member["chat_member_id"] = result.get("update_id")
-                messages.append(chat_member)
-            elif query_or_message == "chat_join_request":
-                chat_join_request = result.get(query_or_message)
-                chat_join_request["update_id"] = result["update_id"]
-                chat_join_request["message_id"] = result.get("update_id")
-                chat_join_request["chat_join_request_id"] = result.get("update_id")
-                messages.append(chat_join_request)
-            else:
-                message_dict = result.get(query_or_message)
-                if isinstance(message_dict, dict):
-                    message_dict["update_id"] = result["update_id"]
-                messages.append(message_dict)
+            priority = len(__update_type_priorities__)
+            for key in result.keys():
+                key_priority = __update_type_priorities__.get(key, priority)
+                if key_priority < priority and result[key]:
+                    query_or_message, priority = key, key_priority
+
+            if self.read_cache is not None and query_or_message != "":
+                self.__invalidate_read_cache(query_or_message, result[query_or_message])
+
+            normalizer = self.__update_normalizers.get(query_or_message)
+            if normalizer is None:
+                messages.append(None)
+                continue
+
+            messages.append(normalizer(result[query_or_message], update_id))
 
         if len(update_ids) >= 1:
             self._offset = max(update_ids) + 1
             return messages
         else:
             return None
-    
+
+    def __invalidate_read_cache(self, update_type, update):
+        """
+        Forget the cached chat reads when the update tells that the chat changed
+        """
+        chat = update.get("chat") if isinstance(update, dict) else None
+        if not isinstance(chat, dict):
+            return
+        if update_type in ["chat_member", "my_chat_member"] or \
+            update.keys() & __read_cache_invalidating_fields__:
+            self.read_cache.invalidate(chat.get("id"))
+
+    def __normalize_inline_query(self, inline_query, update_id):
+        inline_query["update_id"] = update_id
+        inline_query["message_id"] = update_id
+        chat = dict(inline_query.get("from"))
+        chat.pop("language_code", None)
+        chat.pop("is_bot", None)
+        chat["type"] = "private"
+        inline_query["chat"] = chat
+        inline_query["text"] = ""
+        inline_query["query"] = f'{self.__inline_mode_prefix}{inline_query["query"]}' # Inline Mode Plugin Prefix
+        self.__tag_message(inline_query, "query")
+
+        return inline_query
+
+    def __normalize_callback_query(self, callback_query, update_id):
+        message = callback_query.get("message")
+        message["update_id"] = update_id
+        message["click_user"] = callback_query["from"]
+        message["callback_query_id"] = callback_query.get("id")
+        message["callback_query_data"] = callback_query.get("data")
+        self.__tag_message(message, "callback_query_id")
+
+        return message
+
+    def __normalize_chat_member(self, id_key):
+        def normalizer(member_update, update_id):
+            member_update["update_id"] = update_id
+            member_update["message_id"] = update_id
+            member_update[id_key] = update_id
+            self.__tag_message(member_update, id_key)
+
+            return member_update
+
+        return normalizer
+
+    def __normalize_message(self, message, update_id):
+        if isinstance(message, dict):
+            message["update_id"] = update_id
+            self.__mark_message_for_pluginRun(message) # Category tagging messages
+
+        return message
+
+    def __tag_message(self, message, key):
+        """
+        Tag a message with the message type of a key known from its update
+        """
+        _, message_type, field, placeholder = __message_type_table__[key]
+        message["message_type"] = message_type
+        if placeholder is not None:
+            message[field] = placeholder # default prefix of command
+
     # teelebot method
     def message_deletor(self, time_gap: int, chat_id: str, message_id: str) -> str:
         """
@@ -821,6 +959,25 @@ class Bot(object):
 
             return "ok"
 
+    def gather(self, *futures: Future, timeout: float = None) -> list:
+        """
+        Wait for the results of calls made with run_in_thread=True,
+        return them in the order of the Futures
+        """
+        if len(futures) == 1 and isinstance(futures[0], (list, tuple)):
+            futures = futures[0]
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = []
+        for fur in futures:
+            if isinstance(fur, Future):
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                results.append(fur.result(timeout=remaining))
+            else: # Result of a blocking call
+                results.append(fur)
+
+        return results
+
     def path_converter(self, path: str) -> str:
         """
         Convert URI according to operating system
@@ -892,6 +1049,67 @@ class Bot(object):
         else:
             return False
 
+    def download_file(self, file_id: str, dest: str, hash_name: str = None,
+                      resume: bool = True) -> Union[bool, dict]:
+        """
+        Download a file to dest in chunks, resuming an interrupted download,
+        hash_name is the name of a hashlib algorithm to hash the file while downloading
+        """
+        source, size = self.__file_source(file_id)
+        if source is False:
+            return False
+
+        try:
+            return self.downloader.download(source, dest, size, hash_name, resume)
+        except Exception as e: # The download url contains the Bot Key, keep it out of the log
+            _logger.error(f"Error downloading file {file_id}: {type(e).__name__}: " +
+                str(e).replace(str(self._key), "<key>"))
+            return False
+
+    def iter_file(self, file_id: str, start: int = 0):
+        """
+        Iterate over the chunks of a file from byte start on,
+        without holding the whole file in memory
+        """
+        source, size = self.__file_source(file_id)
+        if source is False:
+            return False
+
+        return self.__hide_key(self.downloader.iter_file(source, start))
+
+    def __hide_key(self, chunks):
+        """
+        Pass the chunks through, errors of the transport carry
+        the download url and are raised again without the Bot Key
+        """
+        try:
+            yield from chunks
+        except Exception as e:
+            message = str(e).replace(str(self._key), "<key>")
+            if message == str(e):
+                raise
+            try:
+                error = type(e)(message)
+            except Exception:
+                error = RuntimeError(message)
+            raise error from None
+
+    def __file_source(self, file_id):
+        """
+        Download url of a file, or its path when the local api server keeps it on this host
+        """
+        req = self.getFile(file_id=file_id)
+        if not req:
+            return False, None
+
+        file_path = req["file_path"]
+        if (self._local_api_server != "False" and
+            "telegram.org" not in self._basic_url and
+            os.path.isabs(file_path) and os.path.isfile(file_path)):
+            return file_path, req.get("file_size")
+
+        return f'{self._basic_url}file/bot{self._key}/{file_path}', req.get("file_size")
+
     def getChatAdminsUseridList(self, chat_id, skip_bot: bool = True,
                                 privilege_users: list = None) -> Union[bool, list]:
         """
@@ -1013,3 +1231,33 @@ class MethodPositionalArgumentError(Exception):
         return f'MethodPositionalArgumentError: {self.value}'
 
 
+def _api_method(method_name, params):
+    """
+    Generate the Bot method of a Bot API method,
+    unknown parameters are warned about once and sent as is
+    """
+    params = frozenset(params + __framework_params__)
+    warned = set()
+
+    def api_method(self, *args, **kwargs):
+        if len(args) != 0:
+            _logger.error(f"Method '{method_name}' does not accept positional arguments")
+            raise MethodPositionalArgumentError("Method does not accept positional arguments")
+        if not params.issuperset(kwargs):
+            for param in kwargs.keys() - params - warned:
+                warned.add(param)
+                _logger.warn(f"Unknown parameter '{param}' of method '{method_name}'")
+
+        return self._call_method(method_name, kwargs)
+
+    api_method.__name__ = method_name
+    api_method.__qualname__ = f"Bot.{method_name}"
+    api_method.__doc__ = f"Bot API method {method_name}"
+
+    return api_method
+
+
+for method_name, params in __api_methods__.items():
+    if not hasattr(Bot, method_name):
+        setattr(Bot, method_name, _api_method(method_name, params))
+del method_name, params
@@ -1,12 +1,13 @@
 '''
 @creation date: 2021-04-25
-@last modification: 2024-04-14
+@last modification: 2026-10-18
 '''
 from __future__ import print_function
 from sys import getsizeof, stderr
 from itertools import chain
-from collections import deque
+from collections import deque, OrderedDict
 from pathlib import Path
+from types import MappingProxyType
 from typing import Tuple, Union
 try:
     from reprlib import repr
@@ -14,33 +15,341 @@ except ImportError:
     pass
 
 import threading
-import inspect
+import operator
 import traceback
+import bisect
+import heapq
+import time
+import sys
 import os
 import copy
 
 from .metadata import _Metadata
 from .logger import _logger
 
+
+__eviction_policies__ = (None, "lru", "fifo", "ttl")
+
+__condition_operators__ = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le
+}
+
+
+class _BufferArea(object):
+    """
+    Records of a buffer area and their sizes measured in bytes,
+    with a hash index and a sorted index of the values of each indexed field,
+    records with a ttl expire through a heap of their expiry times,
+    records of a frozen buffer area are read-only and shared with the readers
+    """
+    def __init__(self, indexes=(), policy=None, ttl=None, max_records=0, frozen=False):
+        self.frozen = frozen
+        self.policy = policy
+        self.ttl = ttl
+        self.max_records = max_records
+        self.evicted = 0
+        self.expired = 0
+        self.last_id = -1 # Ids only grow, an id never names another record later
+        self.clear()
+        self.indexes = {field: {} for field in indexes} # field -> value -> ids
+        self.sorted_values = {field: [] for field in indexes} # field -> sorted (rank, value)
+        self.unhashable = {field: set() for field in indexes} # field -> ids of unhashable values
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        """
+        Remove all records, keeping the indexed fields, the policy and the last id
+        """
+        self.records = {}
+        self.sizes = {}
+        self.used = 0
+        self.expires = {} # id -> expiry time
+        self.expiry_heap = [] # (expiry time, id), entries of removed records are skipped
+        self.recency = OrderedDict() # ids from the least to the most recently used
+        for field in getattr(self, "indexes", {}).keys():
+            self.indexes[field].clear()
+            self.sorted_values[field].clear()
+            self.unhashable[field].clear()
+
+    def put(self, idx, record, size, ttl=None):
+        """
+        Store a record, replacing the record of the same id in place,
+        a new record expires after ttl or the ttl of the buffer area
+        """
+        if idx in self.records:
+            self.__unindex_record(idx)
+            self.used -= self.sizes[idx]
+        else:
+            ttl = self.ttl if ttl is None else ttl
+            if ttl is not None and ttl > 0:
+                self.expires[idx] = time.monotonic() + ttl
+                heapq.heappush(self.expiry_heap, (self.expires[idx], idx))
+        self.records[idx] = record
+        self.sizes[idx] = size
+        self.used += size
+        self.touch(idx)
+        for field in self.indexes.keys():
+            if field in record:
+                self.__index(field, record[field], idx)
+
+    def pop(self, idx):
+        """
+        Remove a record, return its size
+        """
+        self.__unindex_record(idx)
+        self.records.pop(idx)
+        self.recency.pop(idx, None)
+        if self.expires.pop(idx, None) is not None and \
+                len(self.expiry_heap) > 2 * len(self.expires) + 64: # Drop the entries of removed records
+            self.expiry_heap = [(expiry, id_x) for id_x, expiry in self.expires.items()]
+            heapq.heapify(self.expiry_heap)
+        size = self.sizes.pop(idx)
+        self.used -= size
+        return size
+
+    def touch(self, idx):
+        """
+        Mark a record as used for the lru policy
+        """
+        if self.policy == "lru":
+            self.recency[idx] = None
+            self.recency.move_to_end(idx)
+
+    def expire(self):
+        """
+        Remove the expired records, return their total size
+        """
+        freed = 0
+        if len(self.expiry_heap) == 0:
+            return freed
+        now = time.monotonic()
+        while len(self.expiry_heap) > 0 and self.expiry_heap[0][0] <= now:
+            expiry, idx = heapq.heappop(self.expiry_heap)
+            if self.expires.get(idx) == expiry:
+                freed += self.pop(idx)
+                self.expired += 1
+        return freed
+
+    def evict(self):
+        """
+        Remove one record by the policy of the buffer area, return its size,
+        None if the policy evicts nothing
+        """
+        if self.policy is None or len(self.records) == 0:
+            return None
+
+        if self.policy == "lru":
+            idx = next(iter(self.recency))
+        else:
+            idx = next(iter(self.records)) # The oldest
+            while self.policy == "ttl" and len(self.expiry_heap) > 0: # The first to expire
+                expiry, id_x = self.expiry_heap[0]
+                if self.expires.get(id_x) == expiry:
+                    idx = id_x
+                    break
+                heapq.heappop(self.expiry_heap)
+
+        self.evicted += 1
+        return self.pop(idx)
+
+    def match(self, conditions):
+        """
+        Get the ids of the records matching all conditions in insertion order,
+        a condition is a value or a dict of range operators such as {"$gte": 1, "$lt": 5}
+        """
+        if self.frozen: # Lists of conditions equal the tuples of the records
+            conditions = {key: value if _range_condition(value) else _freeze(value)
+                for key, value in conditions.items()}
+
+        candidates = None
+        for key, value in conditions.items():
+            if key not in self.indexes:
+                continue
+            ids = self.__lookup(key, value)
+            if ids is not None and (candidates is None or len(ids) < len(candidates)):
+                candidates = ids
+            if candidates is not None and len(candidates) == 0:
+                return []
+
+        if candidates is None:
+            logs = self.records.items()
+        else:
+            logs = [(id_x, self.records[id_x]) for id_x in sorted(candidates)]
+
+        return [id_x for id_x, log in logs if all(
+            _condition_ok(log, key, value) for key, value in conditions.items())]
+
+    def __lookup(self, field, value):
+        """
+        Get the ids of a condition from the index,
+        None if the index can not answer it
+        """
+        if _range_condition(value):
+            bounds = [(operator_name, _sort_key(bound)) for operator_name, bound in value.items()]
+            if any(key is None for _, key in bounds) or len(set(key[0] for _, key in bounds)) != 1:
+                return None
+
+            values = self.sorted_values[field]
+            start, end = 0, len(values)
+            for operator_name, key in bounds:
+                if operator_name == "$gt":
+                    start = max(start, bisect.bisect_right(values, key))
+                elif operator_name == "$gte":
+                    start = max(start, bisect.bisect_left(values, key))
+                elif operator_name == "$lt":
+                    end = min(end, bisect.bisect_left(values, key))
+                else:
+                    end = min(end, bisect.bisect_right(values, key))
+
+            ids = set()
+            for key in values[start:end]:
+                ids.update(self.indexes[field][key[1]])
+            return ids
+
+        try:
+            return self.indexes[field].get(value, set()) | self.unhashable[field]
+        except TypeError: # Unhashable value
+            return None
+
+    def __unindex_record(self, idx):
+        record = self.records[idx]
+        for field in self.indexes.keys():
+            if field in record:
+                self.__unindex(field, record[field], idx)
+
+    def __index(self, field, value, idx):
+        try:
+            ids = self.indexes[field].get(value)
+        except TypeError:
+            self.unhashable[field].add(idx)
+            return
+
+        if ids is None:
+            ids = self.indexes[field][value] = set()
+            key = _sort_key(value)
+            if key is not None:
+                bisect.insort(self.sorted_values[field], key)
+        ids.add(idx)
+
+    def __unindex(self, field, value, idx):
+        try:
+            ids = self.indexes[field].get(value)
+        except TypeError:
+            self.unhashable[field].discard(idx)
+            return
+
+        if ids is None:
+            return
+        ids.discard(idx)
+        if len(ids) == 0:
+            del self.indexes[field][value]
+            key = _sort_key(value)
+            if key is not None:
+                values = self.sorted_values[field]
+                position = bisect.bisect_left(values, key)
+                if position < len(values) and values[position] == key:
+                    del values[position]
+
+
+def _range_condition(value) -> bool:
+    return isinstance(value, dict) and len(value) > 0 and \
+        all(key in __condition_operators__ for key in value.keys())
+
+
+def _condition_ok(log, key, value) -> bool:
+    if key not in log:
+        return False
+    if not _range_condition(value):
+        return log[key] == value
+
+    try:
+        return all(__condition_operators__[operator_name](log[key], bound)
+            for operator_name, bound in value.items())
+    except TypeError: # Not comparable
+        return False
+
+
+def _freeze(value):
+    """
+    Read-only copy of a value, dicts become read-only mappings,
+    lists become tuples and sets become frozensets,
+    immutable values are shared and other objects are deep-copied
+    """
+    if isinstance(value, (str, bytes, int, float, complex, type(None))):
+        return value
+    elif isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    elif type(value) in (list, tuple, deque):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    elif isinstance(value, bytearray):
+        return bytes(value)
+    return copy.deepcopy(value)
+
+
+def _thaw(value):
+    """
+    Deep copy of a value, read-only mappings of records selected from
+    a frozen buffer area become dicts
+    """
+    try:
+        return copy.deepcopy(value)
+    except TypeError: # Read-only mappings can not be deep-copied
+        pass
+
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    elif type(value) in (list, tuple, set, frozenset):
+        return type(value)(_thaw(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def _sort_key(value):
+    """
+    Key of a value in a sorted index, numbers sort before strings,
+    None for values without an order
+    """
+    if isinstance(value, (int, float)) and value == value: # Not NaN
+        return (0, value)
+    elif isinstance(value, str):
+        return (1, value)
+    return None
+
+
 class _Buffer(object):
     """
-    Buffer Class
+    Buffer Class,
+    the sizes of records, buffer areas and plugins are counted on write,
+    each plugin has its own mutex and the total size has a mutex of its own
     """
     def __init__(self, buffer_size, plugin_names, plugin_dir):
         self.__buffer_size = buffer_size
         self.__plugin_names = plugin_names
         self.__plugin_dir = plugin_dir
         self.__buffer_mutex = threading.RLock()
+        self.__capacity_mutex = threading.Lock()
         self.__buffer = {}
+        self.__plugin_mutexes = {}
+        self.__plugin_used = {}
+        self.__used = 0
         self.__metadata = _Metadata(self.__plugin_dir)
 
         for plugin_name in self.__plugin_names:
             self.__buffer[plugin_name] = {}
-            self.__buffer[plugin_name]["default"] = {}
+            self.__buffer[plugin_name]["default"] = _BufferArea()
+            self.__plugin_mutexes[plugin_name] = threading.RLock()
+            self.__plugin_used[plugin_name] = 0
 
     def __del__(self):
         del self.__buffer
         del self.__buffer_mutex
+        del self.__plugin_mutexes
 
     def status(self) -> Tuple[bool, dict]:
         """
@@ -48,8 +357,13 @@ class _Buffer(object):
         measured in bytes
         """
         try:
-            with self.__buffer_mutex:
-                used = self.__total_size(self.__buffer)
+            for plugin_name in list(self.__buffer.keys()): # Reclaim the expired records
+                with self.__mutex(plugin_name):
+                    for area in list(self.__buffer.get(plugin_name, {}).values()):
+                        self.__expire(plugin_name, area)
+
+            with self.__capacity_mutex:
+                used = self.__used
                 free = self.__buffer_size - used
                 size = self.__buffer_size
 
@@ -70,23 +384,30 @@ class _Buffer(object):
         measured in bytes
         """
         if plugin_name in [None, "", " "]:
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
-            with self.__buffer_mutex:
-                return True, self.__total_size(self.__buffer.get(plugin_name))
+            with self.__mutex(plugin_name):
+                for area in list(self.__buffer.get(plugin_name, {}).values()):
+                    self.__expire(plugin_name, area)
+                return True, self.__plugin_used.get(plugin_name, 0)
         else:
             return False, "PluginNotFound"
 
-    def create(self, plugin_name: str = None, buffer_name: str = "default"
-            ) -> Tuple[bool, Union[str, tuple, any]]:
+    def create(self, plugin_name: str = None, buffer_name: str = "default",
+            indexes: list = [], policy: str = None, ttl: float = None,
+            max_records: int = 0, frozen: bool = False) -> Tuple[bool, Union[str, tuple, any]]:
         """
-        Create a buffer area
+        Create a buffer area,
+        conditions on the fields in indexes are looked up in an index instead of scanning the records,
+        the policy "lru", "fifo" or "ttl" evicts records when the buffer is full or max_records is reached,
+        records expire after ttl seconds unless inserted with a ttl of their own,
+        records of a frozen buffer area are stored read-only and selected without being copied
         """
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -97,12 +418,15 @@ class _Buffer(object):
                     return False, "NoPermissionToWrite"
             else:
                 return False, permissions
+            if policy not in __eviction_policies__:
+                return False, "PolicyNotSupported"
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if buffer_name in self.__buffer[plugin_name].keys():
                         return False, "BufferExisted"
                     else:
-                        self.__buffer[plugin_name][buffer_name] = {}
+                        self.__buffer[plugin_name][buffer_name] = _BufferArea(
+                            list(indexes), policy, ttl, int(max_records), bool(frozen))
                         return True, ""
             except Exception as e:
                 _logger.error(e)
@@ -119,7 +443,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -132,9 +456,10 @@ class _Buffer(object):
                 return False, permissions
             
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if buffer_name in self.__buffer[plugin_name].keys():
-                        self.__buffer[plugin_name].pop(buffer_name)
+                        area = self.__buffer[plugin_name].pop(buffer_name)
+                        self.__count(plugin_name, -area.used)
                         return True, ""
                     else:
                         return False, "BufferNotFound"
@@ -152,7 +477,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -165,11 +490,19 @@ class _Buffer(object):
                 return False, permissions
             
             buffers = {}
-            with self.__buffer_mutex:
-                for key, value in self.__buffer[plugin_name].items():
+            with self.__mutex(plugin_name):
+                for key, area in self.__buffer[plugin_name].items():
+                    self.__expire(plugin_name, area)
                     buffers[key] = {
-                        "used": self.__total_size(value),
-                        "count": len(value)
+                        "used": area.used,
+                        "count": len(area),
+                        "indexes": list(area.indexes.keys()),
+                        "policy": area.policy,
+                        "ttl": area.ttl,
+                        "max_records": area.max_records,
+                        "frozen": area.frozen,
+                        "evicted": area.evicted,
+                        "expired": area.expired
                     }
                     
             return True, buffers
@@ -177,14 +510,15 @@ class _Buffer(object):
             return False, "PluginNotFound"
 
     def insert(self, plugin_name: str = None, buffer_name: str = "default",
-            data: dict = {}) -> Tuple[bool, Union[str, tuple]]:
+            data: dict = {}, ttl: float = None) -> Tuple[bool, Union[str, tuple]]:
         """
-        Insert data into the buffer area
+        Insert data into the buffer area,
+        the data expires after ttl seconds
         """
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -197,25 +531,31 @@ class _Buffer(object):
                 return False, permissions
 
             try:
-                with self.__buffer_mutex:
+                frozen = getattr(self.__buffer[plugin_name].get(buffer_name), "frozen", False)
+                record, record_size = self.__copy(data, frozen)
+                with self.__mutex(plugin_name):
                     if buffer_name not in self.__buffer[plugin_name].keys():
                         if buffer_name == "default":
-                            self.__buffer[plugin_name][buffer_name] = {}
+                            self.__buffer[plugin_name][buffer_name] = _BufferArea()
                         else:
                             return False, "BufferNotFound"
 
-                    old_total_used = self.__total_size(self.__buffer)
-                    old_buffer_used = self.__total_size(self.__buffer[plugin_name])
-                    new_buffer_used = self.__total_size(data)
-
-                    if (old_total_used - old_buffer_used) + new_buffer_used > self.__buffer_size:
+                    area = self.__buffer[plugin_name][buffer_name]
+                    if area.frozen != frozen: # Recreated since the copy
+                        record, record_size = self.__copy(data, area.frozen)
+                    self.__expire(plugin_name, area)
+                    if record_size > self.__buffer_size:
                         return False, "BufferAreaIsFull"
-                    else:
-                        last_id = -1
-                        if len(self.__buffer[plugin_name][buffer_name].keys()) > 0:
-                            last_id = max(self.__buffer[plugin_name][buffer_name].keys())
-                        self.__buffer[plugin_name][buffer_name][last_id+1] = copy.deepcopy(data)
-                        return True, last_id+1
+                    while (area.max_records > 0 and len(area) >= area.max_records) or \
+                            not self.__count(plugin_name, record_size):
+                        evicted_size = area.evict()
+                        if evicted_size is None:
+                            return False, "BufferAreaIsFull"
+                        self.__count(plugin_name, -evicted_size)
+
+                    area.last_id += 1
+                    area.put(area.last_id, record, record_size, ttl)
+                    return True, area.last_id
             except Exception as e:
                 _logger.error(e)
                 traceback.print_exc()
@@ -231,7 +571,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -246,28 +586,24 @@ class _Buffer(object):
             selected_logs_idx = []
             changed_size = 0
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if buffer_name not in self.__buffer[plugin_name].keys():
                         if buffer_name == "default":
-                            self.__buffer[plugin_name][buffer_name] = {}
+                            self.__buffer[plugin_name][buffer_name] = _BufferArea()
                         else:
                             return False, "BufferNotFound"
 
+                    area = self.__buffer[plugin_name][buffer_name]
+                    self.__expire(plugin_name, area)
                     if idx != None:
-                        if idx in self.__buffer[plugin_name][buffer_name].keys():
+                        if idx in area.records.keys():
                             selected_logs_idx.append(idx)
                     else:
-                        for id_x, log in self.__buffer[plugin_name][buffer_name].items():
-                            conditions_ok_count = 0
-                            for key, value in conditions.items():
-                                if key in list(log.keys()) and log[key] == value:
-                                    conditions_ok_count += 1
-                            if conditions_ok_count == len(conditions):
-                                    selected_logs_idx.append(id_x)
+                        selected_logs_idx = area.match(conditions)
 
                     for id_x in selected_logs_idx:
-                        changed_size += self.__total_size(self.__buffer[plugin_name][buffer_name][id_x])
-                        self.__buffer[plugin_name][buffer_name].pop(id_x)
+                        changed_size += area.pop(id_x)
+                    self.__count(plugin_name, -changed_size)
                     
                 return True, str(changed_size)
             except Exception as e:
@@ -286,7 +622,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -301,36 +637,41 @@ class _Buffer(object):
             selected_logs_idx = []
             changed_size = 0
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if buffer_name not in self.__buffer[plugin_name].keys():
                         if buffer_name == "default":
-                            self.__buffer[plugin_name][buffer_name] = {}
+                            self.__buffer[plugin_name][buffer_name] = _BufferArea()
                         else:
                             return False, "BufferNotFound"
 
-                    old_total_used = self.__total_size(self.__buffer)
-                    old_buffer_used = self.__total_size(self.__buffer[plugin_name])
-                    new_buffer_used = self.__total_size(data)
-
-                    if (old_total_used - old_buffer_used) + new_buffer_used > self.__buffer_size:
+                    area = self.__buffer[plugin_name][buffer_name]
+                    self.__expire(plugin_name, area)
+                    if idx != None:
+                        if idx in area.records.keys():
+                            selected_logs_idx.append(idx)
+                    else:
+                        selected_logs_idx = area.match(conditions)
+
+                    updated_logs = {}
+                    grown_size = 0
+                    for id_x in selected_logs_idx: # Sized before any change for the capacity check
+                        log = dict(area.records[id_x]) # Records of a frozen buffer area are replaced, not changed
+                        for key, value in data.items():
+                            log[key] = _freeze(value) if area.frozen else _thaw(value)
+                        log_size = self.__total_size(log)
+                        if area.frozen:
+                            log = MappingProxyType(log)
+                        updated_logs[id_x] = (log, log_size)
+                        grown_size += log_size - area.sizes[id_x]
+
+                    if not self.__count(plugin_name, grown_size):
                         return False, "BufferAreaIsFull"
                     else:
-                        if idx != None:
-                            if idx in self.__buffer[plugin_name][buffer_name].keys():
-                                selected_logs_idx.append(idx)
-                        else:
-                            for id_x, log in self.__buffer[plugin_name][buffer_name].items():
-                                conditions_ok_count = 0
-                                for key, value in conditions.items():
-                                    if key in list(log.keys()) and log[key] == value:
-                                        conditions_ok_count += 1
-                                if conditions_ok_count == len(conditions):
-                                        selected_logs_idx.append(id_x)
-
-                        for id_x in selected_logs_idx:
-                            for key, value in data.items():
-                                self.__buffer[plugin_name][buffer_name][id_x][key] = copy.deepcopy(data[key])
-                                changed_size += self.__total_size(data[key])
+                        for id_x, (log, log_size) in updated_logs.items():
+                            area.put(id_x, log, log_size)
+                        if len(selected_logs_idx) > 0:
+                            changed_size = len(selected_logs_idx) * sum(
+                                self.__total_size(value) for value in data.values())
                 return True, str(changed_size)
             except Exception as e:
                 _logger.error(e)
@@ -348,7 +689,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -362,27 +703,28 @@ class _Buffer(object):
 
             selected_logs = {}
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if buffer_name not in self.__buffer[plugin_name].keys():
                         if buffer_name == "default":
-                            self.__buffer[plugin_name][buffer_name] = {}
+                            self.__buffer[plugin_name][buffer_name] = _BufferArea()
                         else:
                             return False, "BufferNotFound"
 
+                    area = self.__buffer[plugin_name][buffer_name]
+                    self.__expire(plugin_name, area)
+                    copy_log = (lambda log: log) if area.frozen else copy.deepcopy # Frozen records are shared
                     if idx != None:
-                        if idx in self.__buffer[plugin_name][buffer_name].keys():
-                            selected_logs[idx] = copy.deepcopy(self.__buffer[plugin_name][buffer_name][idx])
+                        if idx in area.records.keys():
+                            selected_logs[idx] = copy_log(area.records[idx])
                     else:
                         if len(conditions) == 0 or conditions == {}:
-                            return True, copy.deepcopy(self.__buffer[plugin_name][buffer_name])
-
-                        for id_x, log in self.__buffer[plugin_name][buffer_name].items():
-                            conditions_ok_count = 0
-                            for key, value in conditions.items():
-                                if key in list(log.keys()) and log[key] == value:
-                                    conditions_ok_count += 1
-                            if conditions_ok_count == len(conditions):
-                                    selected_logs[id_x] = copy.deepcopy(self.__buffer[plugin_name][buffer_name][id_x])
+                            selected_logs = dict(area.records) if area.frozen else copy.deepcopy(area.records)
+                        else:
+                            for id_x in area.match(conditions):
+                                selected_logs[id_x] = copy_log(area.records[id_x])
+
+                    for id_x in selected_logs.keys():
+                        area.touch(id_x)
                     
                 return True, selected_logs
             except Exception as e:
@@ -400,7 +742,7 @@ class _Buffer(object):
         isSelf = False
         if plugin_name in [None, "", " "]:
             isSelf = True
-            plugin_name = os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]
+            plugin_name = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
 
         if plugin_name in self.__buffer.keys():
             ok, permissions = self.__permissions_check(plugin_name)
@@ -414,16 +756,19 @@ class _Buffer(object):
             
             changed_size = 0
             try:
-                with self.__buffer_mutex:
+                with self.__mutex(plugin_name):
                     if plugin_name != None and buffer_name != None:
                         if buffer_name not in self.__buffer[plugin_name].keys():
                             return False, "BufferNotFound"
 
-                        changed_size = self.__total_size(self.__buffer[plugin_name][buffer_name])
-                        self.__buffer[plugin_name][buffer_name].clear()
+                        area = self.__buffer[plugin_name][buffer_name]
+                        changed_size = area.used
+                        area.clear()
+                        self.__count(plugin_name, -changed_size)
                     elif plugin_name != None and buffer_name == None:
-                        changed_size = self.__total_size(self.__buffer[plugin_name])
+                        changed_size = self.__plugin_used[plugin_name]
                         self.__buffer[plugin_name].clear()
+                        self.__count(plugin_name, -changed_size)
 
                 return True, str(changed_size)
             except Exception as e:
@@ -434,14 +779,20 @@ class _Buffer(object):
             return False, "PluginNotFound"
 
     def _update(self, plugin_names):
-        if str(inspect.stack()[1][3]) == "__load_plugin":
+        if sys._getframe(1).f_code.co_name == "__load_plugin":
             with self.__buffer_mutex:
                 for plugin_name in list(self.__buffer.keys()): # Clean up uninstalled plugins
                     if plugin_name not in plugin_names:
-                        self.__buffer.pop(plugin_name)
+                        with self.__mutex(plugin_name):
+                            self.__buffer.pop(plugin_name)
+                            self.__count(plugin_name, -self.__plugin_used[plugin_name])
+                            self.__plugin_used.pop(plugin_name)
+                            self.__plugin_mutexes.pop(plugin_name)
 
                 for plugin_name in list(plugin_names):
                     if plugin_name not in self.__buffer.keys(): # Add new plugins
+                        self.__plugin_mutexes[plugin_name] = threading.RLock()
+                        self.__plugin_used[plugin_name] = 0
                         self.__buffer[plugin_name] = {}
 
             return True
@@ -450,31 +801,65 @@ class _Buffer(object):
 
     def __permissions_check(self, plugin_name):
         if plugin_name in self.__buffer.keys():
-            if plugin_name != os.path.splitext(os.path.basename(inspect.stack()[1][1]))[0]: # Read/write access check
-                permissions = "False:False"
-                ok, data = self.__metadata.read(plugin_name=plugin_name)
+            if plugin_name != os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]: # Read/write access check
+                ok, data = self.__metadata._parsed(plugin_name)
                 if ok:
-                    if data["Buffer-permissions"] not in [None, "", " "]:
-                        permissions = data["Buffer-permissions"]
-                    bool_dict = {
-                        "True": True,
-                        "true": True,
-                        "False": False,
-                        "false": False
-                    }
-                    permissions_read = bool_dict[permissions.split(":")[0]]
-                    permissions_write = bool_dict[permissions.split(":")[1]]
-
-                    return True, tuple((permissions_read, permissions_write))
+                    return True, data["permissions"]
                 else:
                     return False, data
 
+    def __mutex(self, plugin_name):
+        """
+        Get the mutex of a plugin,
+        the buffer mutex for plugins being removed
+        """
+        return self.__plugin_mutexes.get(plugin_name, self.__buffer_mutex)
+
+    def __copy(self, data, frozen):
+        """
+        Copy data into a record, read-only for a frozen buffer area,
+        return the record and its size
+        """
+        if not frozen:
+            record = _thaw(data)
+            return record, self.__total_size(record)
+
+        record = {key: _freeze(value) for key, value in data.items()}
+        return MappingProxyType(record), self.__total_size(record)
+
+    def __expire(self, plugin_name, area):
+        """
+        Remove the expired records of a buffer area,
+        the caller holds the mutex of the plugin
+        """
+        freed = area.expire()
+        if freed != 0:
+            self.__count(plugin_name, -freed)
+
+    def __count(self, plugin_name, size) -> bool:
+        """
+        Count the size of written or removed records,
+        False if the buffer area has no room for them,
+        the caller holds the mutex of the plugin
+        """
+        with self.__capacity_mutex:
+            if size > 0 and self.__used + size > self.__buffer_size:
+                return False
+            self.__used += size
+        self.__plugin_used[plugin_name] = self.__plugin_used.get(plugin_name, 0) + size
+        return True
+
     def __total_size(self, o, handlers={}, verbose=False):
         dict_handler = lambda d: chain.from_iterable(d.items())
+        copies = [] # Kept until the end, the ids of freed copies could be reused
+        def proxy_handler(d): # Sized as the dict it reads
+            copies.append(d.copy())
+            return copies[-1:]
         all_handlers = {tuple: iter,
                         list: iter,
                         deque: iter,
                         dict: dict_handler,
+                        MappingProxyType: proxy_handler,
                         set: iter,
                         frozenset: iter,
                     }
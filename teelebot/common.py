@@ -1,6 +1,6 @@
 '''
 @creation date: 2023-05-13
-@last modification: 2024-02-29
+@last modification: 2026-10-18
 '''
 
 __cloud_api_server__ = "https://api.telegram.org/"
@@ -66,9 +66,116 @@ __config_template__ = {
     "secret_token": ""
 }
 
+# Update classification tables, listed in order of precedence
+__update_types__ = [
+    "inline_query",
+    "callback_query",
+    "my_chat_member",
+    "chat_member",
+    "chat_join_request",
+    "edited_message",
+    "message"
+]
+__update_type_priorities__ = {
+    update_type: priority for priority, update_type in enumerate(__update_types__)
+}
+
+__message_types__ = [
+    # message key, message_type, field matched with commands, placeholder of the field
+    ("callback_query_id", "callback_query_data", "callback_query_data", None),
+    ("query", "inline_query", "query", None),
+    ("voice_chat_started", "voice_started", "voice_started", ""),
+    ("voice_chat_ended", "voice_ended", "voice_ended", ""),
+    ("voice_chat_participants_invited", "voice_invited", "voice_invited", ""),
+    ("message_auto_delete_timer_changed", "message__timer_changed", "message__timer_changed", ""),
+    ("my_chat_member_id", "my_chat_member_data", "my_chat_member_data", ""),
+    ("chat_member_id", "chat_member_data", "chat_member_data", ""),
+    ("chat_join_request_id", "chat_join_request_data", "chat_join_request_data", ""),
+    ("new_chat_members", "chat_members", "chat_members", ""),
+    ("left_chat_member", "left_member", "left_member", ""),
+    ("photo", "photo", "message_type", None),
+    ("sticker", "sticker", "message_type", None),
+    ("video", "video", "message_type", None),
+    ("audio", "audio", "message_type", None),
+    ("document", "document", "message_type", None),
+    ("contact", "contact", "message_type", None),
+    ("dice", "dice", "message_type", None),
+    ("game", "game", "message_type", None),
+    ("poll", "poll", "message_type", None),
+    ("venue", "venue", "message_type", None),
+    ("location", "location", "message_type", None),
+    ("invoice", "invoice", "message_type", None),
+    ("text", "text", "text", None),
+    ("caption", "caption", "caption", None)
+]
+__message_type_table__ = {
+    item[0]: (priority,) + item[1:] for priority, item in enumerate(__message_types__)
+}
+__message_type_fields__ = {item[1]: item[2] for item in __message_types__}
+__message_type_unknown__ = (len(__message_types__), "unknown", "unknown", None)
+__message_shape_cache_size__ = 1024 # Classifications kept by the keys of a message
+
+# Dispatch priorities of message types, lower priority tasks are shed first
+__dispatch_priorities__ = {
+    "command": 4, # text or caption starting with "/"
+    "callback_query_data": 4,
+    "inline_query": 4,
+    "my_chat_member_data": 3,
+    "chat_member_data": 3,
+    "chat_join_request_data": 3,
+    "chat_members": 3,
+    "left_member": 3,
+    "text": 2,
+    "caption": 2,
+    "photo": 1,
+    "video": 1,
+    "audio": 1,
+    "document": 1,
+    "sticker": 0,
+    "dice": 0,
+    "game": 0
+}
+__dispatch_default_priority__ = 1
+
+# Methods counted against the outbound message limits of Telegram
+__rate_limited_method_prefixes__ = ("send", "forward", "copy")
+__rate_limit_exempt_methods__ = ("sendChatAction",) # Not messages
+__rate_limit_max_retries__ = 3
+
+# Largest piece of a file held in memory while it is uploaded
+__upload_chunk_size__ = 64 * 1024
+__download_chunk_size__ = 64 * 1024
+__download_max_concurrency__ = 8
+
+# Fields of send methods whose file_id is reused by the upload cache
+__upload_cache_fields__ = ["photo", "audio", "document", "video", "animation", "voice", "video_note", "sticker"]
+
+# Idempotent chat reads kept by the read cache with their ttl in seconds
+__read_cache_ttls__ = {
+    "getChat": 300,
+    "getChatAdministrators": 300,
+    "getChatMember": 60,
+    "getChatMemberCount": 60
+}
+# Writes that change what the cached reads of their chat return
+__read_cache_invalidating_methods__ = [
+    "banChatMember", "unbanChatMember", "restrictChatMember", "promoteChatMember",
+    "setChatAdministratorCustomTitle", "banChatSenderChat", "unbanChatSenderChat",
+    "setChatPermissions", "setChatPhoto", "deleteChatPhoto", "setChatTitle", "setChatDescription",
+    "pinChatMessage", "unpinChatMessage", "unpinAllChatMessages",
+    "setChatStickerSet", "deleteChatStickerSet", "approveChatJoinRequest", "leaveChat"
+]
+# Message fields telling that the members or the info of the chat changed
+__read_cache_invalidating_fields__ = [
+    "new_chat_members", "left_chat_member", "new_chat_title", "new_chat_photo",
+    "delete_chat_photo", "pinned_message", "migrate_to_chat_id"
+]
+
 __plugin_init_func_name__ = "Init"
+__plugin_batch_func_suffix__ = "_batch"
 
 __plugin_control_plugin_name__ = "PluginCTL"
 __plugin_control_plugin_command__ = "/pluginctl"
+__plugin_control_cache_size__ = 1024
 
 
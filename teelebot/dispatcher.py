@@ -0,0 +1,332 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import time
+import threading
+import traceback
+
+from collections import deque, OrderedDict
+from typing import Tuple, Callable
+
+from .logger import _logger
+
+
+class _Task(object):
+    __slots__ = ("func", "args", "merge_key", "priority", "seq",
+                 "key", "lane", "queued_at", "cancelled")
+
+    def __init__(self, func, args, merge_key, priority, seq, key, lane):
+        self.func = func
+        self.args = args
+        self.merge_key = merge_key
+        self.priority = priority
+        self.seq = seq
+        self.key = key # (lane, chat key) when dispatching by chat, otherwise None
+        self.lane = lane
+        self.queued_at = time.monotonic()
+        self.cancelled = False
+
+
+class _Lane(object):
+    __slots__ = ("name", "workers", "running", "queued", "ready", "cancelled",
+                 "waits", "wait_count", "wait_total", "wait_max")
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.running = 0
+        self.queued = 0
+        self.ready = deque() # (key, task) ready to run, task is None for a chat queue
+        self.cancelled = 0 # Dropped tasks still in the ready queue
+        self.waits = deque(maxlen=1024) # Recent queue waits for percentiles
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class _Dispatcher(object):
+    """
+    Dispatcher Class
+    """
+    def __init__(self, thread_pool, mode="pool", chat_queue_size=64, chat_policy="drop_oldest",
+                 queue_size=0, policy="block", lanes={}):
+        self.__thread_pool = thread_pool
+        self.__mode = mode
+        self.__chat_queue_size = chat_queue_size
+        self.__chat_policy = chat_policy
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__dispatcher_mutex = threading.RLock()
+        self.__capacity = threading.Condition(self.__dispatcher_mutex)
+
+        self.__lanes = {"default": _Lane("default",
+            thread_pool._max_workers - sum(lanes.values()))}
+        for name, workers in lanes.items():
+            self.__lanes[name] = _Lane(name, workers)
+        self.__chats = {} # key -> queued tasks, kept while the chat has a task queued or running
+        self.__queued = {} # priority -> {seq: task}, every queued task in submission order
+        self.__queued_count = 0
+        self.__seq = 0
+        self.__submitted = 0
+        self.__completed = 0
+        self.__dropped = 0
+        self.__merged = 0
+        self.__rejected = 0
+        self.__blocked = 0
+
+    def __del__(self):
+        del self.__lanes
+        del self.__chats
+        del self.__queued
+
+    def submit(self, func: Callable[..., None], *args: tuple,
+            key=None, merge_key=None, priority=0, lane="default") -> bool:
+        """
+        Submit a task, tasks with the same key run one at a time
+        in submission order when dispatching by chat,
+        return False if the task is dropped
+        """
+        with self.__dispatcher_mutex:
+            if lane not in self.__lanes:
+                lane = "default"
+            if self.__mode != "chat" or key is None:
+                key = None
+            else:
+                key = (lane, key)
+
+            self.__submitted += 1
+            self.__seq += 1
+            task = _Task(func, args, merge_key, priority, self.__seq, key, lane)
+
+            if key is not None and key in self.__chats:
+                queue = self.__chats[key]
+                if self.__chat_queue_size > 0 and len(queue) >= self.__chat_queue_size:
+                    if self.__shed_chat(queue, task):
+                        self.__pump(self.__lanes[lane])
+                        return True
+                    if self.__chat_policy == "drop_newest":
+                        return False
+
+            if not self.__make_room(task):
+                return False
+
+            if key is None:
+                self.__lanes[lane].ready.append((None, task))
+            elif key not in self.__chats:
+                self.__chats[key] = deque([task])
+                self.__lanes[lane].ready.append((key, None))
+            else:
+                self.__chats[key].append(task)
+            self.__queued.setdefault(priority, OrderedDict())[task.seq] = task
+            self.__queued_count += 1
+            self.__lanes[lane].queued += 1
+
+            self.__pump(self.__lanes[lane])
+
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until the dispatch queue has room for more tasks,
+        return False on timeout
+        """
+        if self.__queue_size <= 0:
+            return True
+
+        with self.__capacity:
+            return self.__capacity.wait_for(
+                lambda: self.__queued_count < self.__queue_size, timeout)
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get usage information of the dispatcher and the queue wait of every lane
+        """
+        try:
+            with self.__dispatcher_mutex:
+                lanes = {}
+                for name, lane in self.__lanes.items():
+                    waits = sorted(lane.waits)
+                    lanes[name] = {
+                        "workers": lane.workers,
+                        "running": lane.running,
+                        "queued": lane.queued,
+                        "started": lane.wait_count,
+                        "wait_avg": lane.wait_total / lane.wait_count if lane.wait_count else 0.0,
+                        "wait_p50": self.__percentile(waits, 0.50),
+                        "wait_p95": self.__percentile(waits, 0.95),
+                        "wait_p99": self.__percentile(waits, 0.99),
+                        "wait_max": lane.wait_max
+                    }
+
+                result = {
+                    "mode": self.__mode,
+                    "policy": self.__policy,
+                    "workers": self.__thread_pool._max_workers,
+                    "running": sum([lane.running for lane in self.__lanes.values()]),
+                    "queued": self.__queued_count,
+                    "size": self.__queue_size,
+                    "chats": len(self.__chats),
+                    "submitted": self.__submitted,
+                    "completed": self.__completed,
+                    "dropped": self.__dropped,
+                    "merged": self.__merged,
+                    "rejected": self.__rejected,
+                    "blocked": self.__blocked,
+                    "lanes": lanes
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    @property
+    def mode(self):
+        """
+        Get the dispatch mode, pool or chat
+        """
+        return self.__mode
+
+    @property
+    def lanes(self):
+        """
+        Get the names of the priority lanes
+        """
+        return [name for name in self.__lanes.keys() if name != "default"]
+
+    def busy(self, lane: str = "default") -> bool:
+        """
+        Whether all workers of the lane are in use
+        """
+        lane = self.__lanes.get(lane, self.__lanes["default"])
+        return lane.running >= lane.workers
+
+    def __percentile(self, waits, percent):
+        if not waits:
+            return 0.0
+        return waits[min(len(waits) - 1, int(len(waits) * percent))]
+
+    def __shed_chat(self, queue, task):
+        """
+        Apply the chat policy to a full chat queue, return True if the new task
+        took the place of a queued one, otherwise room is made by dropping
+        """
+        if self.__chat_policy == "drop_newest":
+            self.__dropped += 1
+            return False
+
+        if self.__chat_policy == "merge" and task.merge_key is not None:
+            for i in range(len(queue) - 1, -1, -1):
+                old_task = queue[i]
+                if old_task.merge_key == task.merge_key: # Newer task replaces the queued one in place
+                    task.seq = old_task.seq
+                    queue[i] = task
+                    self.__queued[old_task.priority].pop(old_task.seq)
+                    self.__queued.setdefault(task.priority, OrderedDict())[task.seq] = task
+                    self.__merged += 1
+                    return True
+
+        self.__drop(queue[0])
+        return False
+
+    def __make_room(self, task):
+        """
+        Apply the policy to a full dispatch queue,
+        return False if the new task is dropped
+        """
+        if self.__queue_size <= 0 or self.__queued_count < self.__queue_size:
+            return True
+
+        if self.__policy == "block":
+            self.__blocked += 1
+            self.__capacity.wait_for(lambda: self.__queued_count < self.__queue_size)
+            return True
+
+        if self.__policy == "reject":
+            self.__rejected += 1
+            return False
+
+        victim = None
+        for priority, tasks in self.__queued.items():
+            if not tasks:
+                continue
+            old_task = next(iter(tasks.values()))
+            if self.__policy == "priority":
+                if priority < task.priority and (victim is None or priority < victim.priority):
+                    victim = old_task
+            elif victim is None or old_task.seq < victim.seq:
+                victim = old_task
+
+        if victim is None:
+            self.__dropped += 1
+            return False
+
+        self.__drop(victim)
+        return True
+
+    def __drop(self, task):
+        """
+        Remove a queued task, it is skipped lazily if already in the ready queue
+        """
+        task.cancelled = True
+        self.__queued[task.priority].pop(task.seq)
+        self.__queued_count -= 1
+        self.__dropped += 1
+        lane = self.__lanes[task.lane]
+        lane.queued -= 1
+        if task.key is not None:
+            self.__chats[task.key].remove(task)
+            return
+
+        lane.cancelled += 1
+        if lane.cancelled > self.__queued_count + 64: # Compact the ready queue
+            lane.ready = deque([item for item in lane.ready
+                if item[1] is None or not item[1].cancelled])
+            lane.cancelled = 0
+
+    def __pump(self, lane):
+        while lane.running < lane.workers and lane.ready:
+            key, task = lane.ready.popleft()
+            if task is None:
+                queue = self.__chats[key]
+                if not queue: # Every queued task of the chat was dropped
+                    del self.__chats[key]
+                    continue
+                task = queue.popleft()
+            elif task.cancelled:
+                lane.cancelled -= 1
+                continue
+
+            wait = time.monotonic() - task.queued_at
+            lane.waits.append(wait)
+            lane.wait_count += 1
+            lane.wait_total += wait
+            if wait > lane.wait_max:
+                lane.wait_max = wait
+
+            self.__queued[task.priority].pop(task.seq)
+            self.__queued_count -= 1
+            lane.queued -= 1
+            lane.running += 1
+            self.__thread_pool.submit(self.__run, key, task)
+            self.__capacity.notify_all()
+
+    def __run(self, key, task):
+        try:
+            task.func(*task.args)
+        except Exception as e:
+            _logger.error(f"EXCEPTION - {str(e)}")
+            traceback.print_exc()
+        finally:
+            with self.__dispatcher_mutex:
+                lane = self.__lanes[task.lane]
+                lane.running -= 1
+                self.__completed += 1
+                if key is not None:
+                    if self.__chats[key]: # Go to the back, other chats run in between
+                        lane.ready.append((key, None))
+                    else:
+                        del self.__chats[key]
+                self.__pump(lane)
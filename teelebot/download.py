@@ -0,0 +1,161 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import os
+import shutil
+import hashlib
+import threading
+import traceback
+
+from typing import Tuple
+
+from .logger import _logger
+from .common import __download_chunk_size__
+
+
+class _Downloader(object):
+    """
+    Downloader Class,
+    files are streamed in chunks over the connection pool of the request,
+    or linked or copied in the kernel when the local api server keeps them on this host
+    """
+    def __init__(self, request, max_downloads, chunk_size=__download_chunk_size__):
+        self.__request = request
+        self.__chunk_size = chunk_size
+        self.__download_slots = threading.BoundedSemaphore(max_downloads)
+        self.__downloader_mutex = threading.Lock()
+
+        self.__running = 0
+        self.__downloads = 0
+        self.__resumed = 0
+        self.__local = 0
+        self.__bytes = 0
+
+    def iter_file(self, source, start=0):
+        """
+        Yield the chunks of a file from byte start on,
+        source is a download url or a local file path
+        """
+        with self.__download_slots:
+            self.__count(running=1)
+            try:
+                if os.path.isabs(source):
+                    with open(source, "rb") as f:
+                        f.seek(start)
+                        for chunk in iter(lambda: f.read(self.__chunk_size), b""):
+                            self.__count(size=len(chunk))
+                            yield chunk
+                else:
+                    for chunk in self.__request.stream(source, start, self.__chunk_size):
+                        self.__count(size=len(chunk))
+                        yield chunk
+            finally:
+                self.__count(running=-1)
+
+    def download(self, source, dest, size=None, hash_name=None, resume=True) -> dict:
+        """
+        Download a file to dest through dest.part,
+        an interrupted download is resumed from the size of dest.part
+        """
+        digest = hashlib.new(hash_name) if hash_name is not None else None
+        part_path = f"{dest}.part"
+        if os.path.isabs(source):
+            self.__copy_local(source, part_path)
+            size = os.path.getsize(part_path)
+            if digest is not None:
+                self.__hash_file(part_path, digest, size)
+        else:
+            start = 0
+            if resume and os.path.isfile(part_path):
+                start = os.path.getsize(part_path)
+                if size is not None and start > size: # Not a part of this file
+                    start = 0
+            if start > 0 and digest is not None:
+                self.__hash_file(part_path, digest, start)
+            if start > 0:
+                self.__count(resumed=1)
+
+            with open(part_path, "ab" if start > 0 else "wb") as f:
+                if size is None or start < size:
+                    for chunk in self.iter_file(source, start):
+                        f.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+                size = f.tell()
+
+        os.replace(part_path, dest)
+        self.__count(downloads=1)
+
+        return {
+            "path": dest,
+            "size": size,
+            "hash": digest.hexdigest() if digest is not None else None
+        }
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the number of downloads and downloaded bytes
+        """
+        try:
+            with self.__downloader_mutex:
+                result = {
+                    "running": self.__running,
+                    "downloads": self.__downloads,
+                    "resumed": self.__resumed,
+                    "local": self.__local,
+                    "bytes": self.__bytes
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def __copy_local(self, source, part_path):
+        """
+        Hard link the file of the local api server,
+        or copy it in the kernel across file systems
+        """
+        if os.path.lexists(part_path):
+            os.remove(part_path)
+
+        with self.__download_slots:
+            self.__count(running=1, local=1)
+            try:
+                try:
+                    os.link(source, part_path)
+                    return
+                except OSError:
+                    pass
+
+                with open(source, "rb") as src, open(part_path, "wb") as dst:
+                    if hasattr(os, "sendfile"):
+                        offset, size = 0, os.fstat(src.fileno()).st_size
+                        while offset < size:
+                            sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                            if sent == 0:
+                                break
+                            offset += sent
+                    else:
+                        shutil.copyfileobj(src, dst, self.__chunk_size)
+            finally:
+                self.__count(running=-1)
+
+    def __hash_file(self, path, digest, size):
+        with open(path, "rb") as f:
+            while size > 0:
+                chunk = f.read(min(self.__chunk_size, size))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size -= len(chunk)
+
+    def __count(self, running=0, downloads=0, resumed=0, local=0, size=0):
+        with self.__downloader_mutex:
+            self.__running += running
+            self.__downloads += downloads
+            self.__resumed += resumed
+            self.__local += local
+            self.__bytes += size
@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 '''
 @creation date: 2019-08-23
-@last modification: 2024-02-28
+@last modification: 2026-10-18
 '''
 import configparser
 import argparse
@@ -54,6 +54,8 @@ parser.add_argument(
     "-hi", "--hide_info", help="hide plugin info-level console logs", action="store_true")
 parser.add_argument(
     "-d", "--debug", help="run teelebot in debug mode", action="store_true")
+parser.add_argument(
+    "-a", "--asyncio", help="run teelebot on the asyncio core (requires aiohttp)", action="store_true")
 parser.add_argument(
     "-v", "--version", help="show the current version of teelebot", action="store_true")
 args = parser.parse_args()
@@ -65,6 +67,13 @@ if len(sys.argv) == 2 and args.version:
     os._exit(0)
 
 
+def _asyncio_core():
+    '''
+    Whether to run the bot on the asyncio core
+    '''
+    return args.asyncio
+
+
 def _config():
     '''
     Get the bot configuration information and initialize
@@ -300,6 +309,15 @@ def _config():
     else:
         config["pool_size"] = "40"
 
+    if "webhook_workers" in config.keys():
+        if not config["webhook_workers"].isdigit() or \
+            int(config["webhook_workers"]) < 1 or int(config["webhook_workers"]) > 100:
+            _logger.error("Webhook workers webhook_workers is out of range (1-100).")
+            os._exit(0)
+        config["webhook_workers"] = int(config["webhook_workers"])
+    else:
+        config["webhook_workers"] = min(int(config["pool_size"]), 100)
+
     if "buffer_size" in config.keys():
         if int(config["buffer_size"]) <= 0:
             _logger.error("Data buffer_size is out of range (> 0 MiB).")
@@ -307,6 +325,101 @@ def _config():
     else:
         config["buffer_size"] = "16"
 
+    if "plugin_debounce" in config.keys():
+        try:
+            config["plugin_debounce"] = float(config["plugin_debounce"])
+        except ValueError:
+            config["plugin_debounce"] = -1
+        if config["plugin_debounce"] <= 0:
+            _logger.error("Plugin watcher plugin_debounce is out of range (> 0 seconds).")
+            os._exit(0)
+    else:
+        config["plugin_debounce"] = 1.0
+
+    if "dispatch_mode" in config.keys():
+        if config["dispatch_mode"] not in ["pool", "chat"]:
+            _logger.error("Dispatch mode dispatch_mode must be pool or chat.")
+            os._exit(0)
+    else:
+        config["dispatch_mode"] = "pool"
+
+    if "dispatch_chat_queue_size" in config.keys():
+        if not config["dispatch_chat_queue_size"].isdigit():
+            _logger.error("Chat queue size dispatch_chat_queue_size is out of range (>= 0, 0 is unlimited).")
+            os._exit(0)
+        config["dispatch_chat_queue_size"] = int(config["dispatch_chat_queue_size"])
+    else:
+        config["dispatch_chat_queue_size"] = 64
+
+    if "dispatch_chat_policy" in config.keys():
+        if config["dispatch_chat_policy"] not in ["drop_oldest", "drop_newest", "merge"]:
+            _logger.error("Chat queue policy dispatch_chat_policy must be drop_oldest, drop_newest or merge.")
+            os._exit(0)
+    else:
+        config["dispatch_chat_policy"] = "drop_oldest"
+
+    if "dispatch_queue_size" in config.keys():
+        if not config["dispatch_queue_size"].isdigit():
+            _logger.error("Dispatch queue size dispatch_queue_size is out of range (>= 0, 0 is unlimited).")
+            os._exit(0)
+        config["dispatch_queue_size"] = int(config["dispatch_queue_size"])
+    else:
+        config["dispatch_queue_size"] = 0
+
+    if "dispatch_policy" in config.keys():
+        if config["dispatch_policy"] not in ["block", "drop_oldest", "priority", "reject"]:
+            _logger.error("Dispatch queue policy dispatch_policy must be block, drop_oldest, priority or reject.")
+            os._exit(0)
+    else:
+        config["dispatch_policy"] = "block"
+
+    dispatch_lanes = {}
+    if "dispatch_lanes" in config.keys() and config["dispatch_lanes"].strip() != "":
+        for lane in config["dispatch_lanes"].split(","):
+            lane = lane.strip().split(":")
+            if len(lane) != 2 or lane[0].strip() in ["", "default"] or \
+                not lane[1].strip().isdigit() or int(lane[1]) < 1:
+                _logger.error("Priority lanes dispatch_lanes must be like message_type:workers,message_type:workers.")
+                os._exit(0)
+            dispatch_lanes[lane[0].strip()] = int(lane[1])
+    config["dispatch_lanes"] = dispatch_lanes
+
+    if "polling_timeout" in config.keys():
+        if not config["polling_timeout"].isdigit() or int(config["polling_timeout"]) > 50:
+            _logger.error("Long polling polling_timeout is out of range (0-50 seconds).")
+            os._exit(0)
+        config["polling_timeout"] = int(config["polling_timeout"])
+    else:
+        config["polling_timeout"] = 10
+
+    if "upload_cache" in config.keys():
+        if not config["upload_cache"].isdigit():
+            _logger.error("Upload cache size upload_cache must be an integer (0 is disabled).")
+            os._exit(0)
+        config["upload_cache"] = int(config["upload_cache"])
+    else:
+        config["upload_cache"] = 0
+    config["upload_cache_dir"] = str(Path(path))
+
+    if "read_cache" in config.keys():
+        if not config["read_cache"].isdigit():
+            _logger.error("Read cache size read_cache must be an integer (0 is disabled).")
+            os._exit(0)
+        config["read_cache"] = int(config["read_cache"])
+    else:
+        config["read_cache"] = 0
+
+    if "rate_limit" in config.keys():
+        if config["rate_limit"] == "True":
+            config["rate_limit"] = True
+        elif config["rate_limit"] == "False":
+            config["rate_limit"] = False
+        else:
+            _logger.error("The rate_limit field value in the configuration file is wrong.")
+            os._exit(0)
+    else:
+        config["rate_limit"] = False
+
     if "local_api_server" in config.keys():
         local_api_server = config["local_api_server"]
         if (local_api_server == None or
@@ -1,8 +1,9 @@
 '''
 @creation date: 2023-05-12
-@last modification: 2024-02-28
+@last modification: 2026-10-18
 '''
 import os
+import re
 import copy
 import inspect
 import traceback
@@ -14,6 +15,103 @@ from typing import Tuple, Union
 from .logger import _logger
 from .common import __metadata_templates__, __metadata_version_in_use__
 
+
+__metadata_cache__ = {} # METADATA path -> parsed METADATA, shared by all _Metadata
+__metadata_cache_mutex__ = threading.RLock()
+
+
+def _version_tuple(version: str, normalize: bool = True) -> tuple:
+    """
+    Convert a version string into a comparable tuple of integers
+    """
+    numbers = []
+    for part in str(version).strip(" <>=!~").split("."):
+        digits = ""
+        for char in part.strip():
+            if not char.isdigit():
+                break
+            digits += char
+        if digits == "":
+            break
+        numbers.append(int(digits))
+
+    while normalize and len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+
+    return tuple(numbers)
+
+
+def _version_specifiers(requires: str) -> Union[list, None]:
+    """
+    Parse PEP 440 style version specifiers such as ">=2.3.0, <3",
+    a bare version is treated as the minimum version,
+    return None if the specifiers are invalid
+    """
+    specifiers = []
+    for clause in str(requires).split(","):
+        clause = clause.strip()
+        if clause == "":
+            continue
+
+        operator = ""
+        for op in ["~=", "==", "!=", "<=", ">=", "<", ">", "="]:
+            if clause.startswith(op):
+                operator = op
+                break
+        version = clause[len(operator):].strip()
+        if operator == "":
+            operator = ">="
+        elif operator == "=":
+            operator = "=="
+
+        wildcard = version.endswith(".*")
+        if wildcard:
+            if operator not in ["==", "!="]:
+                return None
+            version = version[:-2]
+
+        if not re.match(r"^[0-9]+(\.[0-9]+)*([A-Za-z0-9.+-]*)$", version):
+            return None
+        numbers = _version_tuple(version, normalize=False)
+
+        if wildcard:
+            specifiers.append((operator, numbers, True))
+        elif operator == "~=":
+            if len(numbers) < 2:
+                return None
+            specifiers.append((">=", _version_tuple(version), False))
+            specifiers.append(("==", numbers[:-1], True))
+        else:
+            specifiers.append((operator, _version_tuple(version), False))
+
+    return specifiers
+
+
+def _version_satisfies(version: tuple, specifiers: list) -> bool:
+    """
+    Check whether the version tuple satisfies all the version specifiers
+    """
+    for operator, numbers, wildcard in specifiers:
+        if wildcard:
+            padded = version + (0,) * (len(numbers) - len(version))
+            if (padded[:len(numbers)] == numbers) != (operator == "=="):
+                return False
+        elif operator == ">=" and not version >= numbers:
+            return False
+        elif operator == "<=" and not version <= numbers:
+            return False
+        elif operator == ">" and not version > numbers:
+            return False
+        elif operator == "<" and not version < numbers:
+            return False
+        elif operator == "==" and not version == numbers:
+            return False
+        elif operator == "!=" and not version != numbers:
+            return False
+
+    return True
+
+
 class _Metadata(object):
     """
     METADATA Class
@@ -40,6 +138,17 @@ class _Metadata(object):
         else:
             plugin_dir = f'{Path(plugin_dir)}{os.sep}'
 
+        metadata_path = f"{plugin_dir}{plugin_name}{os.sep}METADATA"
+        try:
+            stat = os.stat(metadata_path)
+            with __metadata_cache_mutex__:
+                cached = __metadata_cache__.get(metadata_path)
+            if cached is not None and \
+                cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                return self.__copy_result(cached["result"])
+        except OSError:
+            stat = None
+
         if not os.path.isdir(str(Path(plugin_dir))) or \
             not os.path.exists(Path(plugin_dir)):
             return False, "PluginDirNotFound"
@@ -47,11 +156,86 @@ class _Metadata(object):
         if not os.path.isdir(str(Path(f"{plugin_dir}{plugin_name}"))) or \
             not os.path.exists(Path(f"{plugin_dir}{plugin_name}")):
             return False, "PluginNotFound"
-        
+
+        ok, metadata = self.__parse(plugin_name, metadata_path)
+        if stat is not None and metadata != "ReadMetadataError":
+            self.__cache(metadata_path, stat, (ok, metadata))
+
+        return self.__copy_result((ok, metadata))
+
+    def _parsed(self, plugin_name: str) -> Tuple[bool, Union[dict, str]]:
+        """
+        Get the cached METADATA of the plugin with pre-parsed fields,
+        no file system access once cached
+        """
+        metadata_path = f"{self.__plugin_dir}{plugin_name}{os.sep}METADATA"
+        with __metadata_cache_mutex__:
+            cached = __metadata_cache__.get(metadata_path)
+        if cached is None:
+            ok, data = self.read(plugin_name=plugin_name)
+            if not ok:
+                return False, data
+            with __metadata_cache_mutex__:
+                cached = __metadata_cache__.get(metadata_path)
+            if cached is None:
+                return False, "ReadMetadataError"
+
+        if not cached["result"][0]:
+            return False, cached["result"][1]
+
+        return True, cached["parsed"]
+
+    def _invalidate(self, plugin_name: str = None) -> bool:
+        """
+        Drop cached METADATA of one plugin, or of every plugin in the plugin dir
+        """
+        with __metadata_cache_mutex__:
+            if plugin_name in [None, "", " "]:
+                for metadata_path in list(__metadata_cache__.keys()):
+                    if metadata_path.startswith(self.__plugin_dir):
+                        __metadata_cache__.pop(metadata_path)
+            else:
+                __metadata_cache__.pop(
+                    f"{self.__plugin_dir}{plugin_name}{os.sep}METADATA", None)
+
+        return True
+
+    def __cache(self, metadata_path, stat, result):
+        parsed = None
+        ok, metadata = result
+        if ok:
+            bool_dict = {
+                "True": True,
+                "true": True,
+                "False": False,
+                "false": False
+            }
+            permissions = metadata["Buffer-permissions"].split(":")
+            parsed = {
+                "metadata": metadata,
+                "requires": _version_specifiers(metadata["Requires-teelebot"]),
+                "permissions": (bool_dict[permissions[0]], bool_dict[permissions[1]])
+            }
+
+        with __metadata_cache_mutex__:
+            __metadata_cache__[metadata_path] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "result": result,
+                "parsed": parsed
+            }
+
+    def __copy_result(self, result):
+        ok, metadata = result
+        if ok:
+            return ok, dict(metadata)
+        return ok, metadata
+
+    def __parse(self, plugin_name, metadata_path):
         metadata = {}
         try:
             with self.__metadata_mutex:
-                with open(Path(f"{plugin_dir}{plugin_name}{os.sep}METADATA"), "r", encoding="utf-8") as meta:
+                with open(metadata_path, "r", encoding="utf-8") as meta:
                     lines = meta.readlines()
                     for line in lines:
                         line = line.strip("\n").strip(" ")
@@ -147,6 +331,8 @@ class _Metadata(object):
             with self.__metadata_mutex:
                 with open(Path(f"{plugin_dir}{plugin_name}{os.sep}METADATA"), "w", encoding="utf-8") as meta:
                     meta.writelines(metadata_list)
+            with __metadata_cache_mutex__:
+                __metadata_cache__.pop(f"{plugin_dir}{plugin_name}{os.sep}METADATA", None)
             return True, ""
         except Exception as e:
             os.system("")
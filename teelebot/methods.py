@@ -0,0 +1,201 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+
+# Bot API methods and their parameters, each one becomes a method of Bot,
+# methods missing here are still called through Bot.__getattr__
+__api_version__ = "7.11"
+
+# Parameters handled by teelebot itself
+__framework_params__ = ("run_in_thread", "del_msg_after", "files")
+
+__send_params__ = (
+    "business_connection_id", "chat_id", "message_thread_id", "disable_notification",
+    "protect_content", "allow_paid_broadcast", "message_effect_id", "reply_parameters",
+    "reply_markup", "reply_to_message_id", "allow_sending_without_reply"
+)
+__caption_params__ = ("caption", "parse_mode", "caption_entities", "show_caption_above_media")
+__edit_params__ = ("business_connection_id", "chat_id", "message_id", "inline_message_id", "reply_markup")
+__invoice_params__ = (
+    "title", "description", "payload", "provider_token", "currency", "prices",
+    "max_tip_amount", "suggested_tip_amounts", "provider_data", "photo_url", "photo_size",
+    "photo_width", "photo_height", "need_name", "need_phone_number", "need_email",
+    "need_shipping_address", "send_phone_number_to_provider", "send_email_to_provider", "is_flexible"
+)
+__forum_topic_params__ = ("chat_id", "message_thread_id")
+
+__api_methods__ = {
+    # Getting updates
+    "getUpdates": ("offset", "limit", "timeout", "allowed_updates"),
+    "setWebhook": ("url", "certificate", "ip_address", "max_connections", "allowed_updates",
+                   "drop_pending_updates", "secret_token"),
+    "deleteWebhook": ("drop_pending_updates",),
+    "getWebhookInfo": (),
+
+    # Available methods
+    "getMe": (),
+    "logOut": (),
+    "close": (),
+    "sendMessage": __send_params__ + ("text", "parse_mode", "entities", "link_preview_options",
+                                      "disable_web_page_preview"),
+    "forwardMessage": ("chat_id", "message_thread_id", "from_chat_id", "disable_notification",
+                       "protect_content", "message_id"),
+    "forwardMessages": ("chat_id", "message_thread_id", "from_chat_id", "message_ids",
+                        "disable_notification", "protect_content"),
+    "copyMessage": __send_params__ + __caption_params__ + ("from_chat_id", "message_id"),
+    "copyMessages": ("chat_id", "message_thread_id", "from_chat_id", "message_ids",
+                     "disable_notification", "protect_content", "remove_caption"),
+    "sendPhoto": __send_params__ + __caption_params__ + ("photo", "has_spoiler"),
+    "sendAudio": __send_params__ + __caption_params__ + ("audio", "duration", "performer", "title",
+                                                         "thumbnail", "thumb"),
+    "sendDocument": __send_params__ + __caption_params__ + ("document", "thumbnail", "thumb",
+                                                            "disable_content_type_detection"),
+    "sendVideo": __send_params__ + __caption_params__ + ("video", "duration", "width", "height",
+                                                         "thumbnail", "thumb", "has_spoiler",
+                                                         "supports_streaming"),
+    "sendAnimation": __send_params__ + __caption_params__ + ("animation", "duration", "width", "height",
+                                                             "thumbnail", "thumb", "has_spoiler"),
+    "sendVoice": __send_params__ + __caption_params__ + ("voice", "duration"),
+    "sendVideoNote": __send_params__ + ("video_note", "duration", "length", "thumbnail", "thumb"),
+    "sendPaidMedia": __send_params__ + __caption_params__ + ("star_count", "media", "payload"),
+    "sendMediaGroup": __send_params__ + ("media",),
+    "sendLocation": __send_params__ + ("latitude", "longitude", "horizontal_accuracy", "live_period",
+                                       "heading", "proximity_alert_radius"),
+    "sendVenue": __send_params__ + ("latitude", "longitude", "title", "address", "foursquare_id",
+                                    "foursquare_type", "google_place_id", "google_place_type"),
+    "sendContact": __send_params__ + ("phone_number", "first_name", "last_name", "vcard"),
+    "sendPoll": __send_params__ + ("question", "question_parse_mode", "question_entities", "options",
+                                   "is_anonymous", "type", "allows_multiple_answers", "correct_option_id",
+                                   "explanation", "explanation_parse_mode", "explanation_entities",
+                                   "open_period", "close_date", "is_closed"),
+    "sendDice": __send_params__ + ("emoji",),
+    "sendChatAction": ("business_connection_id", "chat_id", "message_thread_id", "action"),
+    "setMessageReaction": ("chat_id", "message_id", "reaction", "is_big"),
+    "getUserProfilePhotos": ("user_id", "offset", "limit"),
+    "getFile": ("file_id",),
+    "banChatMember": ("chat_id", "user_id", "until_date", "revoke_messages"),
+    "unbanChatMember": ("chat_id", "user_id", "only_if_banned"),
+    "restrictChatMember": ("chat_id", "user_id", "permissions", "use_independent_chat_permissions",
+                           "until_date"),
+    "promoteChatMember": ("chat_id", "user_id", "is_anonymous", "can_manage_chat", "can_delete_messages",
+                          "can_manage_video_chats", "can_manage_voice_chats", "can_restrict_members",
+                          "can_promote_members", "can_change_info", "can_invite_users", "can_post_stories",
+                          "can_edit_stories", "can_delete_stories", "can_post_messages",
+                          "can_edit_messages", "can_pin_messages", "can_manage_topics"),
+    "setChatAdministratorCustomTitle": ("chat_id", "user_id", "custom_title"),
+    "banChatSenderChat": ("chat_id", "sender_chat_id"),
+    "unbanChatSenderChat": ("chat_id", "sender_chat_id"),
+    "setChatPermissions": ("chat_id", "permissions", "use_independent_chat_permissions"),
+    "exportChatInviteLink": ("chat_id",),
+    "createChatInviteLink": ("chat_id", "name", "expire_date", "member_limit", "creates_join_request"),
+    "editChatInviteLink": ("chat_id", "invite_link", "name", "expire_date", "member_limit",
+                           "creates_join_request"),
+    "createChatSubscriptionInviteLink": ("chat_id", "name", "subscription_period", "subscription_price"),
+    "editChatSubscriptionInviteLink": ("chat_id", "invite_link", "name"),
+    "revokeChatInviteLink": ("chat_id", "invite_link"),
+    "approveChatJoinRequest": ("chat_id", "user_id"),
+    "declineChatJoinRequest": ("chat_id", "user_id"),
+    "setChatPhoto": ("chat_id", "photo"),
+    "deleteChatPhoto": ("chat_id",),
+    "setChatTitle": ("chat_id", "title"),
+    "setChatDescription": ("chat_id", "description"),
+    "pinChatMessage": ("business_connection_id", "chat_id", "message_id", "disable_notification"),
+    "unpinChatMessage": ("business_connection_id", "chat_id", "message_id"),
+    "unpinAllChatMessages": ("chat_id",),
+    "leaveChat": ("chat_id",),
+    "getChat": ("chat_id",),
+    "getChatAdministrators": ("chat_id",),
+    "getChatMemberCount": ("chat_id",),
+    "getChatMember": ("chat_id", "user_id"),
+    "setChatStickerSet": ("chat_id", "sticker_set_name"),
+    "deleteChatStickerSet": ("chat_id",),
+    "getForumTopicIconStickers": (),
+    "createForumTopic": ("chat_id", "name", "icon_color", "icon_custom_emoji_id"),
+    "editForumTopic": ("chat_id", "message_thread_id", "name", "icon_custom_emoji_id"),
+    "closeForumTopic": __forum_topic_params__,
+    "reopenForumTopic": __forum_topic_params__,
+    "deleteForumTopic": __forum_topic_params__,
+    "unpinAllForumTopicMessages": __forum_topic_params__,
+    "editGeneralForumTopic": ("chat_id", "name"),
+    "closeGeneralForumTopic": ("chat_id",),
+    "reopenGeneralForumTopic": ("chat_id",),
+    "hideGeneralForumTopic": ("chat_id",),
+    "unhideGeneralForumTopic": ("chat_id",),
+    "unpinAllGeneralForumTopicMessages": ("chat_id",),
+    "answerCallbackQuery": ("callback_query_id", "text", "show_alert", "url", "cache_time"),
+    "getUserChatBoosts": ("chat_id", "user_id"),
+    "getBusinessConnection": ("business_connection_id",),
+    "setMyCommands": ("commands", "scope", "language_code"),
+    "deleteMyCommands": ("scope", "language_code"),
+    "getMyCommands": ("scope", "language_code"),
+    "setMyName": ("name", "language_code"),
+    "getMyName": ("language_code",),
+    "setMyDescription": ("description", "language_code"),
+    "getMyDescription": ("language_code",),
+    "setMyShortDescription": ("short_description", "language_code"),
+    "getMyShortDescription": ("language_code",),
+    "setChatMenuButton": ("chat_id", "menu_button"),
+    "getChatMenuButton": ("chat_id",),
+    "setMyDefaultAdministratorRights": ("rights", "for_channels"),
+    "getMyDefaultAdministratorRights": ("for_channels",),
+
+    # Updating messages
+    "editMessageText": __edit_params__ + ("text", "parse_mode", "entities", "link_preview_options",
+                                          "disable_web_page_preview"),
+    "editMessageCaption": __edit_params__ + __caption_params__,
+    "editMessageMedia": __edit_params__ + ("media",),
+    "editMessageLiveLocation": __edit_params__ + ("latitude", "longitude", "live_period",
+                                                  "horizontal_accuracy", "heading",
+                                                  "proximity_alert_radius"),
+    "stopMessageLiveLocation": __edit_params__,
+    "editMessageReplyMarkup": __edit_params__,
+    "stopPoll": ("business_connection_id", "chat_id", "message_id", "reply_markup"),
+    "deleteMessage": ("chat_id", "message_id"),
+    "deleteMessages": ("chat_id", "message_ids"),
+
+    # Stickers
+    "sendSticker": __send_params__ + ("sticker", "emoji"),
+    "getStickerSet": ("name",),
+    "getCustomEmojiStickers": ("custom_emoji_ids",),
+    "uploadStickerFile": ("user_id", "sticker", "sticker_format", "png_sticker"),
+    "createNewStickerSet": ("user_id", "name", "title", "stickers", "sticker_type", "needs_repainting",
+                            "sticker_format", "png_sticker", "tgs_sticker", "webm_sticker", "emojis",
+                            "contains_masks", "mask_position"),
+    "addStickerToSet": ("user_id", "name", "sticker", "png_sticker", "tgs_sticker", "webm_sticker",
+                        "emojis", "mask_position"),
+    "setStickerPositionInSet": ("sticker", "position"),
+    "deleteStickerFromSet": ("sticker",),
+    "replaceStickerInSet": ("user_id", "name", "old_sticker", "sticker"),
+    "setStickerEmojiList": ("sticker", "emoji_list"),
+    "setStickerKeywords": ("sticker", "keywords"),
+    "setStickerMaskPosition": ("sticker", "mask_position"),
+    "setStickerSetTitle": ("name", "title"),
+    "setStickerSetThumbnail": ("name", "user_id", "thumbnail", "format", "thumb"),
+    "setStickerSetThumb": ("name", "user_id", "thumb"),
+    "setCustomEmojiStickerSetThumbnail": ("name", "custom_emoji_id"),
+    "deleteStickerSet": ("name",),
+
+    # Inline mode
+    "answerInlineQuery": ("inline_query_id", "results", "cache_time", "is_personal", "next_offset",
+                          "button", "switch_pm_text", "switch_pm_parameter"),
+    "answerWebAppQuery": ("web_app_query_id", "result"),
+
+    # Payments
+    "sendInvoice": __send_params__ + __invoice_params__ + ("start_parameter",),
+    "createInvoiceLink": __invoice_params__ + ("subscription_period",),
+    "answerShippingQuery": ("shipping_query_id", "ok", "shipping_options", "error_message"),
+    "answerPreCheckoutQuery": ("pre_checkout_query_id", "ok", "error_message"),
+    "getStarTransactions": ("offset", "limit"),
+    "refundStarPayment": ("user_id", "telegram_payment_charge_id"),
+
+    # Telegram Passport
+    "setPassportDataErrors": ("user_id", "errors"),
+
+    # Games
+    "sendGame": __send_params__ + ("game_short_name",),
+    "setGameScore": ("user_id", "score", "force", "disable_edit_message", "chat_id", "message_id",
+                     "inline_message_id"),
+    "getGameHighScores": ("user_id", "chat_id", "message_id", "inline_message_id")
+}
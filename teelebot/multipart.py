@@ -0,0 +1,253 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import io
+import os
+import mmap
+import uuid
+
+from pathlib import Path
+
+from .common import __upload_chunk_size__
+
+
+class _MultipartEncoder(object):
+    """
+    Multipart Encoder Class,
+    a file-like multipart/form-data body read in chunks of at most chunk_size bytes,
+    file contents are never loaded into memory as a whole
+    """
+    def __init__(self, data, files, chunk_size=__upload_chunk_size__):
+        self.__boundary = uuid.uuid4().hex
+        self.__chunk_size = chunk_size
+        self.__parts = [] # [header, source, length]
+        self.__opened = {} # index of a path part -> file object opened by the encoder
+        self.__starts = {} # index of a stream part -> position of the stream when the body starts
+
+        for name, value in data.items():
+            if value is None:
+                continue
+            if not isinstance(value, bytes):
+                value = str(value).encode("utf-8")
+            self.__add_part(name, None, None, value)
+
+        for name, value in files.items():
+            filename, content_type = None, None
+            if isinstance(value, tuple): # (filename, content[, content_type])
+                if len(value) > 2:
+                    content_type = value[2]
+                filename, value = value[0], value[1]
+            if filename is None:
+                filename = self.__guess_filename(value) or name
+            self.__add_part(name, filename, content_type, value)
+
+        self.__closing = f"--{self.__boundary}--\r\n".encode("utf-8")
+        self.__length = len(self.__closing)
+        for part in self.__parts:
+            if part[2] is None:
+                self.__length = None
+                break
+            self.__length += len(part[0]) + part[2] + 2
+
+        self.__part = 0
+        self.__offset = 0 # Offset in the current part, the header included
+        self.__started = False
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.__boundary}"
+
+    @property
+    def length(self):
+        """
+        Size of the body, None if a part is a stream of unknown size
+        """
+        return self.__length
+
+    def __len__(self):
+        if self.__length is None:
+            raise TypeError("The size of the multipart body is unknown")
+        return self.__length - self.tell()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.__chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def body(self):
+        """
+        The encoder itself if its size is known, otherwise a generator for chunked encoding
+        """
+        if self.__length is None:
+            return iter(self)
+        return self
+
+    def tell(self) -> int:
+        position = 0
+        for index in range(min(self.__part, len(self.__parts))):
+            header, source, length = self.__parts[index]
+            position += len(header) + (length or 0) + 2
+        if self.__part > len(self.__parts): # The whole body is read
+            position += len(self.__closing)
+        return position + self.__offset
+
+    def seek(self, offset, whence=io.SEEK_SET) -> int:
+        """
+        Rewind the body, e.g. to send it again after a failed attempt
+        """
+        if whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Only absolute positions are supported")
+
+        if offset == 0 and not self.__started:
+            return 0
+        if self.__length is None:
+            raise io.UnsupportedOperation("A body of unknown size can not be rewound")
+
+        self.__part, self.__offset = len(self.__parts), 0
+        position = 0
+        for index, (header, source, length) in enumerate(self.__parts):
+            size = len(header) + (length or 0) + 2
+            if offset < position + size:
+                self.__part, self.__offset = index, offset - position
+                break
+            position += size
+        else:
+            self.__offset = min(offset - position, len(self.__closing))
+
+        for index in range(self.__part, len(self.__parts)):
+            self.__rewind(index)
+        return offset
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            size = self.__chunk_size
+        size = min(size, self.__chunk_size)
+        self.__started = True
+
+        chunks = []
+        while size > 0:
+            chunk = self.__read_part(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def close(self):
+        for fp in self.__opened.values():
+            fp.close()
+        self.__opened.clear()
+        for part in self.__parts:
+            if isinstance(part[1], memoryview):
+                part[1].release() # Let the caller close a memory-mapped file
+
+    def __add_part(self, name, filename, content_type, value):
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        header = f"--{self.__boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type is not None:
+            header += f"Content-Type: {content_type}\r\n"
+        header = (header + "\r\n").encode("utf-8")
+
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+            value = memoryview(value).cast("B")
+            length = value.nbytes
+        elif isinstance(value, Path):
+            length = value.stat().st_size
+        else:
+            length = self.__stream_size(value)
+            self.__starts[len(self.__parts)] = value.tell() if length is not None else None
+
+        self.__parts.append([header, value, length])
+
+    def __guess_filename(self, value):
+        if isinstance(value, Path):
+            return value.name
+        name = getattr(value, "name", None)
+        if isinstance(name, str) and name[0] != "<" and name[-1] != ">":
+            return os.path.basename(name)
+        return None
+
+    def __stream_size(self, fp):
+        try:
+            return os.fstat(fp.fileno()).st_size - fp.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+        try:
+            position = fp.tell()
+            end = fp.seek(0, io.SEEK_END)
+            fp.seek(position)
+            return end - position
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def __file(self, index):
+        source = self.__parts[index][1]
+        if isinstance(source, Path):
+            if index not in self.__opened:
+                self.__opened[index] = open(source, "rb")
+            return self.__opened[index]
+        return source
+
+    def __rewind(self, index):
+        header, source, length = self.__parts[index]
+        skip = max(self.__offset - len(header), 0) if index == self.__part else 0
+        if isinstance(source, memoryview):
+            return
+        if isinstance(source, Path):
+            if index in self.__opened:
+                self.__opened.pop(index).close()
+            if skip != 0:
+                self.__file(index).seek(skip)
+            return
+
+        source.seek(self.__starts[index] + skip)
+
+    def __read_part(self, size):
+        if self.__part > len(self.__parts):
+            return b""
+        if self.__part == len(self.__parts):
+            chunk = self.__closing[self.__offset:self.__offset + size]
+            self.__offset += len(chunk)
+            if self.__offset >= len(self.__closing):
+                self.__part, self.__offset = len(self.__parts) + 1, 0
+            return chunk
+
+        header, source, length = self.__parts[self.__part]
+        if self.__offset < len(header):
+            chunk = header[self.__offset:self.__offset + size]
+            self.__offset += len(chunk)
+            return chunk
+
+        offset = self.__offset - len(header)
+        if length is None or offset < length:
+            if isinstance(source, memoryview):
+                chunk = source[offset:offset + size].tobytes()
+            else:
+                chunk = self.__file(self.__part).read(
+                    size if length is None else min(size, length - offset))
+            if chunk:
+                self.__offset += len(chunk)
+                return chunk
+            if length is not None: # The file is shorter than it was
+                raise IOError(f"File of field {self.__part} is truncated while uploading")
+            self.__parts[self.__part][2] = length = offset
+
+        tail = b"\r\n"[offset - length:]
+        self.__offset += len(tail)
+        if offset + len(tail) >= length + 2:
+            if self.__part in self.__opened:
+                self.__opened.pop(self.__part).close()
+            self.__part, self.__offset = self.__part + 1, 0
+        return tail
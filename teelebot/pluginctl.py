@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import os
+import time
+import threading
+import traceback
+
+from collections import OrderedDict
+from typing import Tuple, Union
+
+from .logger import _logger
+from .common import __plugin_control_plugin_name__
+
+
+class _PluginCTL(object):
+    """
+    PluginCTL Class
+    """
+    def __init__(self, plugin_dir, cache_size=1024, check_interval=1.0):
+        self.__db_dir = f"{plugin_dir}{__plugin_control_plugin_name__}{os.sep}db{os.sep}"
+        self.__cache_size = cache_size
+        self.__check_interval = check_interval
+        self.__pluginctl_mutex = threading.RLock()
+        self.__cache = OrderedDict() # chat_id -> [disabled plugins, mtime, last check]
+
+    def __del__(self):
+        del self.__cache
+
+    def read(self, chat_id: str) -> Tuple[bool, Union[str, list]]:
+        """
+        Get the list of plugins disabled in the chat
+        """
+        if chat_id in [None, "", " "]:
+            return False, "ChatIdNotFound"
+
+        try:
+            return True, sorted(self._disabled(chat_id))
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, str(e)
+
+    def write(self, chat_id: str, plugins: list) -> Tuple[bool, str]:
+        """
+        Set the list of plugins disabled in the chat
+        """
+        if chat_id in [None, "", " "]:
+            return False, "ChatIdNotFound"
+        if not isinstance(plugins, (list, tuple, set, frozenset)):
+            return False, "PluginsMustBeList"
+
+        disabled = frozenset([str(plugin).strip() for plugin in plugins
+            if str(plugin).strip() not in ["", " "]])
+        db_path = f"{self.__db_dir}{str(chat_id)}.db"
+        try:
+            with self.__pluginctl_mutex:
+                if not os.path.isdir(self.__db_dir):
+                    os.makedirs(self.__db_dir)
+                with open(db_path, "w") as f:
+                    f.write(",".join(sorted(disabled)))
+                self.__remember(str(chat_id), disabled, os.stat(db_path).st_mtime_ns)
+
+            return True, ""
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, str(e)
+
+    def invalidate(self, chat_id: str = None) -> Tuple[bool, str]:
+        """
+        Forget the cached disabled plugins of the chat, or of all chats
+        """
+        with self.__pluginctl_mutex:
+            if chat_id in [None, "", " "]:
+                self.__cache.clear()
+            else:
+                self.__cache.pop(str(chat_id), None)
+
+        return True, ""
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get usage information of the PluginCTL cache
+        """
+        try:
+            with self.__pluginctl_mutex:
+                used = len(self.__cache)
+                size = self.__cache_size
+
+            result = {
+                "used": used,
+                "free": size - used,
+                "size": size
+            }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def _disabled(self, chat_id) -> frozenset:
+        """
+        Get the set of plugins disabled in the chat,
+        the db file is checked for changes at most once per check interval
+        """
+        chat_id = str(chat_id)
+        now = time.monotonic()
+        with self.__pluginctl_mutex:
+            entry = self.__cache.get(chat_id)
+            if entry is not None:
+                self.__cache.move_to_end(chat_id)
+                if now - entry[2] < self.__check_interval:
+                    return entry[0]
+
+        db_path = f"{self.__db_dir}{chat_id}.db"
+        try:
+            mtime = os.stat(db_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if entry is not None and entry[1] == mtime:
+            with self.__pluginctl_mutex:
+                entry[2] = now
+            return entry[0]
+
+        disabled = frozenset()
+        if mtime is not None:
+            with open(db_path, "r") as f:
+                plugin_setting = f.read().strip()
+            disabled = frozenset([plugin for plugin in plugin_setting.split(',')
+                if plugin not in ["", " "]])
+
+        with self.__pluginctl_mutex:
+            self.__remember(chat_id, disabled, mtime)
+
+        return disabled
+
+    def __remember(self, chat_id, disabled, mtime):
+        self.__cache[chat_id] = [disabled, mtime, time.monotonic()]
+        self.__cache.move_to_end(chat_id)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
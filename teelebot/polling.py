@@ -1,35 +1,143 @@
 # -*- coding:utf-8 -*-
 '''
 @creation date: 2020-06-23
-@last modification: 2023-12-26
+@last modification: 2026-10-18
 '''
 import os
+import time
+import random
+import threading
+import traceback
+
+from collections import deque
+from typing import Tuple
 
 from .logger import _logger
 
 
-def _runUpdates(bot):
+class _Poller(object):
+    """
+    Poller Class
+    """
+    def __init__(self, bot, timeout=10, backoff=1.0, backoff_max=60.0):
+        self.__bot = bot
+        self.__timeout = timeout
+        self.__backoff = backoff
+        self.__backoff_max = backoff_max
+        self.__poller_mutex = threading.RLock()
 
-    _logger.info("Bot Start.")
+        self.__failures = 0
+        self.__fetches = 0
+        self.__errors = 0
+        self.__empty = 0
+        self.__updates = 0
+        self.__page_max = 0
+        self.__latencies = deque(maxlen=1024) # Recent fetch latencies for percentiles
+        self.__latency_total = 0.0
+        self.__latency_max = 0.0
 
-    bot._update_plugins_init_status()
-    bot._plugins_init(bot)
+    def __del__(self):
+        del self.__latencies
 
-    while True:
-        try:
-            results = bot.getUpdates(
-                offset=bot._offset,
-                limit=100,
-                timeout=bot._timeout,
-                allowed_updates=bot._allowed_updates
-            ) # Get the message queue 'messages'
-            messages = bot._washUpdates(results)
+    def run(self):
+        """
+        Fetch and dispatch updates forever
+        """
+        while True:
+            self.__bot.dispatcher.wait() # Only acknowledge the last page once there is room for more
+            results = self.__fetch(self.__bot._offset)
+
+            messages = self.__bot._washUpdates(results)
             if messages is None or not messages:
                 continue
-            for message in messages:  # Retrieve a single message 'message'
-                bot._pluginRun(bot, message)
-        except KeyboardInterrupt:
-            _logger.info("Bot Exit.")
-            os._exit(0)
+            self.__bot._pluginRunBatch(self.__bot, messages) # Run plugins for the whole page
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the getUpdates latency and page size statistics
+        """
+        try:
+            with self.__poller_mutex:
+                fetched = self.__fetches - self.__errors
+                latencies = sorted(self.__latencies)
+                result = {
+                    "timeout": self.__timeout,
+                    "fetches": self.__fetches,
+                    "errors": self.__errors,
+                    "failures": self.__failures,
+                    "empty": self.__empty,
+                    "updates": self.__updates,
+                    "page_avg": self.__updates / fetched if fetched else 0.0,
+                    "page_max": self.__page_max,
+                    "latency_avg": self.__latency_total / fetched if fetched else 0.0,
+                    "latency_p50": self.__percentile(latencies, 0.50),
+                    "latency_p95": self.__percentile(latencies, 0.95),
+                    "latency_max": self.__latency_max
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def __percentile(self, values, percent):
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * percent))]
+
+    def __fetch(self, offset):
+        """
+        Call getUpdates once, backing off exponentially with jitter after errors
+        """
+        start = time.monotonic()
+        try:
+            results = self.__bot.getUpdates(
+                offset=offset,
+                limit=100,
+                timeout=self.__timeout,
+                allowed_updates=self.__bot._allowed_updates
+            )
+        except Exception as e:
+            _logger.error(f"Failed to get updates: {str(e)}")
+            traceback.print_exc()
+            results = False
+        latency = time.monotonic() - start
+
+        with self.__poller_mutex:
+            self.__fetches += 1
+            if not isinstance(results, list):
+                self.__errors += 1
+                self.__failures += 1
+                failures = self.__failures
+            else:
+                self.__failures = failures = 0
+                self.__updates += len(results)
+                if len(results) == 0:
+                    self.__empty += 1
+                if len(results) > self.__page_max:
+                    self.__page_max = len(results)
+                self.__latencies.append(latency)
+                self.__latency_total += latency
+                if latency > self.__latency_max:
+                    self.__latency_max = latency
+
+        if failures > 0:
+            delay = min(self.__backoff_max, self.__backoff * 2 ** (failures - 1))
+            time.sleep(delay / 2 + random.uniform(0, delay / 2))
+            return False
+
+        return results
+
 
+def _runUpdates(bot):
+
+    _logger.info("Bot Start.")
+
+    bot._update_plugins_init_status()
+    bot._plugins_init(bot)
 
+    try:
+        bot.poller.run()
+    except KeyboardInterrupt:
+        _logger.info("Bot Exit.")
+        os._exit(0)
@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import time
+import threading
+import traceback
+
+from collections import OrderedDict
+from typing import Tuple
+
+from .logger import _logger
+
+
+class _RateLimiter(object):
+    """
+    Rate Limiter Class,
+    token buckets kept as theoretical arrival times so that a send
+    can be scheduled ahead instead of failing
+    """
+    def __init__(self, global_rate=30.0, private_rate=1.0, group_rate=20 / 60,
+                 global_burst=30, private_burst=1, group_burst=20, max_chats=10000):
+        self.__global = (1.0 / global_rate, (global_burst - 1) / global_rate)
+        self.__private = (1.0 / private_rate, (private_burst - 1) / private_rate)
+        self.__group = (1.0 / group_rate, (group_burst - 1) / group_rate)
+        self.__max_chats = max_chats
+        self.__limiter_mutex = threading.RLock()
+
+        self.__global_tat = 0.0
+        self.__chat_tats = OrderedDict() # chat_id -> theoretical arrival time
+        self.__reserved = 0
+        self.__delayed = 0
+        self.__delay_total = 0.0
+        self.__delay_max = 0.0
+        self.__retries = 0
+
+    def __del__(self):
+        del self.__chat_tats
+
+    def reserve(self, chat_id=None) -> float:
+        """
+        Reserve a send in the global bucket and the bucket of the chat,
+        return the seconds to wait before sending
+        """
+        now = time.monotonic()
+        with self.__limiter_mutex:
+            interval, tolerance = self.__global
+            send_at = max(now, self.__global_tat - tolerance)
+
+            chat_key = None
+            if chat_id not in [None, "", " "]:
+                chat_key = str(chat_id)
+                chat_interval, chat_tolerance = self.__chat_bucket(chat_key)
+                chat_tat = self.__chat_tats.get(chat_key, 0.0)
+                send_at = max(send_at, chat_tat - chat_tolerance)
+
+            self.__global_tat = max(self.__global_tat, send_at) + interval
+            if chat_key is not None:
+                self.__chat_tats[chat_key] = max(chat_tat, send_at) + chat_interval
+                self.__chat_tats.move_to_end(chat_key)
+                while len(self.__chat_tats) > self.__max_chats:
+                    self.__chat_tats.popitem(last=False)
+
+            delay = send_at - now
+            self.__reserved += 1
+            if delay > 0:
+                self.__delayed += 1
+                self.__delay_total += delay
+                if delay > self.__delay_max:
+                    self.__delay_max = delay
+
+        return max(delay, 0.0)
+
+    def penalize(self, chat_id=None, retry_after=1) -> bool:
+        """
+        Hold back sends after a 429 response for retry_after seconds,
+        in the chat if known, otherwise globally
+        """
+        until = time.monotonic() + float(retry_after)
+        with self.__limiter_mutex:
+            self.__retries += 1
+            if chat_id in [None, "", " "]:
+                interval, tolerance = self.__global
+                self.__global_tat = max(self.__global_tat, until + tolerance)
+            else:
+                chat_key = str(chat_id)
+                interval, tolerance = self.__chat_bucket(chat_key)
+                self.__chat_tats[chat_key] = max(
+                    self.__chat_tats.get(chat_key, 0.0), until + tolerance)
+
+        return True
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the number of reserved and delayed sends and the delays
+        """
+        try:
+            with self.__limiter_mutex:
+                result = {
+                    "reserved": self.__reserved,
+                    "delayed": self.__delayed,
+                    "delay_avg": self.__delay_total / self.__delayed if self.__delayed else 0.0,
+                    "delay_max": self.__delay_max,
+                    "retries": self.__retries,
+                    "chats": len(self.__chat_tats)
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def __chat_bucket(self, chat_key):
+        if chat_key[0] in ["-", "@"]: # Groups, supergroups and channels
+            return self.__group
+        return self.__private
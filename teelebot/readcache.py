@@ -0,0 +1,206 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import copy
+import json
+import time
+import asyncio
+import threading
+import traceback
+
+from collections import OrderedDict
+from typing import Tuple
+
+from .logger import _logger
+from .common import (
+    __read_cache_ttls__,
+    __read_cache_invalidating_methods__
+    )
+
+
+class _ReadCache(object):
+    """
+    Read Cache Class,
+    results of idempotent chat reads kept for a ttl per method,
+    concurrent identical reads share one request
+    """
+    def __init__(self, size=1024, ttls=__read_cache_ttls__):
+        self.__size = size
+        self.__ttls = ttls
+        self.__read_cache_mutex = threading.Lock()
+        self.__results = OrderedDict() # key -> [result, expiry, chat_id]
+        self.__chat_keys = {} # chat_id -> keys of the chat
+        self.__loading = {} # key -> [event, result, chat_id, stale] of a read in flight
+        self.__async_loading = {} # key -> [future, None, chat_id, stale] of a read in flight on the event loop
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__shared = 0
+        self.__invalidations = 0
+        self.__evictions = 0
+
+    def __del__(self):
+        del self.__results
+
+    def cacheable(self, method_name) -> bool:
+        return method_name in self.__ttls
+
+    def load(self, method_name, params, loader):
+        """
+        Get the result of a read from the cache, from a read in flight or by calling loader
+        """
+        key, chat_id = self.__key(method_name, params)
+        with self.__read_cache_mutex:
+            hit, result = self.__lookup(key)
+            loading = self.__loading.get(key)
+            if hit:
+                pass
+            elif loading is None:
+                loading = self.__loading[key] = [threading.Event(), False, chat_id, False]
+                self.__misses += 1
+                leader = True
+            else:
+                self.__shared += 1
+                leader = False
+
+        if hit:
+            return copy.deepcopy(result)
+        if not leader:
+            loading[0].wait()
+            return copy.deepcopy(loading[1])
+
+        try:
+            loading[1] = loader()
+            self.__store(method_name, key, loading)
+        finally:
+            with self.__read_cache_mutex:
+                self.__loading.pop(key, None)
+            loading[0].set()
+
+        return copy.deepcopy(loading[1])
+
+    async def aload(self, method_name, params, loader):
+        """
+        Get the result of a read on the event loop, loader returns an awaitable
+        """
+        key, chat_id = self.__key(method_name, params)
+        with self.__read_cache_mutex:
+            hit, result = self.__lookup(key)
+            loading = self.__async_loading.get(key)
+            if hit:
+                pass
+            elif loading is None:
+                loading = self.__async_loading[key] = [
+                    asyncio.get_running_loop().create_future(), None, chat_id, False]
+                self.__misses += 1
+                leader = True
+            else:
+                self.__shared += 1
+                leader = False
+
+        if hit:
+            return copy.deepcopy(result)
+        if not leader:
+            return copy.deepcopy(await asyncio.shield(loading[0]))
+
+        try:
+            loading[1] = await loader()
+            self.__store(method_name, key, loading)
+        finally:
+            with self.__read_cache_mutex:
+                self.__async_loading.pop(key, None)
+            loading[0].set_result(loading[1] if loading[1] is not None else False)
+
+        return copy.deepcopy(loading[1])
+
+    def invalidate(self, chat_id=None) -> bool:
+        """
+        Forget the cached reads of the chat, or of all chats
+        """
+        with self.__read_cache_mutex:
+            self.__invalidations += 1
+            for loading in list(self.__loading.values()) + list(self.__async_loading.values()):
+                if chat_id in [None, "", " "] or loading[2] == str(chat_id):
+                    loading[3] = True # Do not cache what is read meanwhile
+
+            if chat_id in [None, "", " "]:
+                self.__results.clear()
+                self.__chat_keys.clear()
+                return True
+
+            for key in self.__chat_keys.pop(str(chat_id), ()):
+                self.__results.pop(key, None)
+
+        return True
+
+    def written(self, method_name, params) -> bool:
+        """
+        Invalidate the chat of a successful write changing what the cached reads return
+        """
+        if method_name not in __read_cache_invalidating_methods__:
+            return False
+        return self.invalidate(params.get("chat_id"))
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the number of cached reads, hits, misses and shared reads
+        """
+        try:
+            with self.__read_cache_mutex:
+                requests = self.__hits + self.__misses + self.__shared
+                result = {
+                    "size": len(self.__results),
+                    "max_size": self.__size,
+                    "hits": self.__hits,
+                    "misses": self.__misses,
+                    "hit_rate": (self.__hits + self.__shared) / requests if requests else 0.0,
+                    "shared": self.__shared,
+                    "invalidations": self.__invalidations,
+                    "evictions": self.__evictions
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def __key(self, method_name, params):
+        chat_id = str(params.get("chat_id", ""))
+        items = sorted((str(k), str(v)) for k, v in params.items() if v is not None)
+        return f"{method_name}:{json.dumps(items)}", chat_id
+
+    def __lookup(self, key):
+        entry = self.__results.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.__results.move_to_end(key)
+            self.__hits += 1
+            return True, entry[0]
+
+        if entry is not None: # Expired
+            self.__forget(key)
+        return False, None
+
+    def __store(self, method_name, key, loading):
+        result, chat_id = loading[1], loading[2]
+        if result is False or result is None:
+            return
+
+        with self.__read_cache_mutex:
+            if loading[3]: # Invalidated while loading
+                return
+            self.__results[key] = [result, time.monotonic() + self.__ttls[method_name], chat_id]
+            self.__results.move_to_end(key)
+            self.__chat_keys.setdefault(chat_id, set()).add(key)
+            while len(self.__results) > self.__size:
+                self.__forget(next(iter(self.__results)))
+                self.__evictions += 1
+
+    def __forget(self, key):
+        result, expiry, chat_id = self.__results.pop(key)
+        keys = self.__chat_keys.get(chat_id)
+        if keys is not None:
+            keys.discard(key)
+            if len(keys) == 0:
+                del self.__chat_keys[chat_id]
@@ -0,0 +1,215 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import os
+import threading
+import traceback
+
+from .handler import _bridge, _plugin_info
+from .metadata import _Metadata, _version_tuple, _version_satisfies
+from .logger import _logger
+
+
+class _PluginRegistry(object):
+    """
+    Plugin Registry Class
+    """
+    def __init__(self, plugin_dir, version, plugin_bridge, non_plugin_list,
+                 plugin_info, non_plugin_info, debounce=1.0):
+        self.__plugin_dir = plugin_dir
+        self.__version = _version_tuple(version)
+        self.__debounce = debounce
+        self.__registry_mutex = threading.RLock()
+        self.__metadata_reader = _Metadata(self.__plugin_dir)
+
+        self.__generation = 0
+        self.__plugin_bridge = plugin_bridge
+        self.__non_plugin_list = non_plugin_list
+        self.__plugin_info = plugin_info
+        self.__non_plugin_info = non_plugin_info
+        self.__metadata = self.__read_metadata(plugin_bridge.keys())
+        self.__signature = self.__scan()
+        self.__compatibility = self.__check_compatibility(plugin_bridge.keys(),
+            self.__metadata, self.__find_conflicts(self.__signature))
+
+        self.__watcher = None
+        self.__watcher_stop = threading.Event()
+
+    def __del__(self):
+        self.stop()
+
+    def start(self) -> bool:
+        """
+        Start watching the plugin directory for changes
+        """
+        with self.__registry_mutex:
+            if self.__watcher is not None and self.__watcher.is_alive():
+                return False
+
+            self.__watcher_stop.clear()
+            self.__watcher = threading.Thread(
+                target=self.__watch, name="PluginRegistryWatcher", daemon=True)
+            self.__watcher.start()
+
+        return True
+
+    def stop(self) -> bool:
+        """
+        Stop watching the plugin directory
+        """
+        self.__watcher_stop.set()
+
+        return True
+
+    def reload(self, signature=None) -> bool:
+        """
+        Rescan the plugin directory and publish a new generation
+        """
+        if signature is None:
+            signature = self.__scan()
+
+        try:
+            self.__metadata_reader._invalidate()
+            plugin_bridge, non_plugin_list = _bridge(self.__plugin_dir)
+            plugin_info = _plugin_info(plugin_bridge.keys(), self.__plugin_dir)
+            non_plugin_info = _plugin_info(non_plugin_list, self.__plugin_dir)
+            metadata = self.__read_metadata(plugin_bridge.keys())
+            compatibility = self.__check_compatibility(plugin_bridge.keys(),
+                metadata, self.__find_conflicts(signature))
+        except Exception as e:
+            _logger.error(f"Failed to reload plugins: {str(e)}")
+            traceback.print_exc()
+            return False
+
+        with self.__registry_mutex:
+            self.__plugin_bridge = plugin_bridge
+            self.__non_plugin_list = non_plugin_list
+            self.__plugin_info = plugin_info
+            self.__non_plugin_info = non_plugin_info
+            self.__metadata = metadata
+            self.__signature = signature
+            self.__compatibility = compatibility
+            self.__generation += 1
+
+        return True
+
+    def snapshot(self) -> tuple:
+        """
+        Get the current generation of the plugin bridge and plugin information,
+        the returned objects are replaced on reload and never modified in place
+        """
+        with self.__registry_mutex:
+            return (
+                self.__generation,
+                self.__plugin_bridge,
+                self.__non_plugin_list,
+                self.__plugin_info,
+                self.__non_plugin_info
+            )
+
+    def metadata(self, plugin_name: str) -> tuple:
+        """
+        Get the pre-parsed METADATA data of the plugin read at the last reload
+        """
+        metadata = self.__metadata.get(plugin_name)
+        if metadata is None:
+            return False, "PluginNotFound"
+
+        return metadata
+
+    def compatible(self, plugin_name: str) -> tuple:
+        """
+        Whether the plugin can be run by this teelebot, checked at the last reload,
+        the reason is given if not
+        """
+        return self.__compatibility.get(plugin_name, (False, "PluginNotFound"))
+
+    @property
+    def generation(self):
+        """
+        Get the generation number, increased on every reload
+        """
+        return self.__generation
+
+    def __read_metadata(self, plugin_names):
+        metadata = {}
+        for plugin_name in plugin_names:
+            metadata[plugin_name] = self.__metadata_reader._parsed(plugin_name)
+
+        return metadata
+
+    def __check_compatibility(self, plugin_names, metadata, conflicts):
+        compatibility = {}
+        for plugin_name in plugin_names:
+            ok, data = metadata.get(plugin_name, (False, "PluginNotFound"))
+            if not ok:
+                reason = f"failed to get information about the plugin (error: {data})"
+            elif data["requires"] is None or len(data["requires"]) == 0:
+                reason = "failed to get the version of the plugin"
+            elif not _version_satisfies(self.__version, data["requires"]):
+                reason = f"the plugin requires teelebot version {data['metadata']['Requires-teelebot']}"
+            elif plugin_name in conflicts:
+                reason = f"there is a module named '{plugin_name}.py' under the plugin dir " + \
+                    f"with the same name as plugin {plugin_name} ({self.__plugin_dir}{plugin_name}.py)"
+            else:
+                reason = ""
+            compatibility[plugin_name] = (reason == "", reason)
+
+        return compatibility
+
+    def __find_conflicts(self, signature):
+        conflicts = set()
+        for name, stats in signature or ():
+            if stats is None:
+                conflicts.add(os.path.splitext(name)[0])
+
+        return conflicts
+
+    def __scan(self):
+        """
+        Cheap fingerprint of the plugin directory: the package names plus
+        the mtime and size of their entrance file and METADATA
+        """
+        signature = []
+        try:
+            with os.scandir(self.__plugin_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir():
+                        if name == "__pycache__" or name[0] == ".":
+                            continue
+                        stats = []
+                        for file_name in (f"{name}.py", "METADATA"):
+                            try:
+                                stat = os.stat(os.path.join(entry.path, file_name))
+                                stats.append((stat.st_mtime_ns, stat.st_size))
+                            except OSError:
+                                stats.append(None)
+                        signature.append((name, tuple(stats)))
+                    elif name.endswith(".py"):
+                        signature.append((name, None))
+        except OSError:
+            return None
+
+        signature.sort()
+        return tuple(signature)
+
+    def __watch(self):
+        pending = None
+        while not self.__watcher_stop.wait(self.__debounce):
+            try:
+                signature = self.__scan()
+                if signature is None or signature == self.__signature:
+                    pending = None
+                    continue
+                if signature != pending: # Still changing, wait for it to settle
+                    pending = signature
+                    continue
+
+                self.reload(signature)
+                pending = None
+            except Exception as e:
+                _logger.error(f"Plugin registry watcher error: {str(e)}")
+                traceback.print_exc()
@@ -1,14 +1,24 @@
 # -*- coding:utf-8 -*-
 '''
 @creation date: 2019-11-15
-@last modification: 2024-05-16
+@last modification: 2026-10-18
 '''
 import io
 import json
+import time
+import mmap
 import traceback
 import requests
 
 from .logger import _logger
+from .multipart import _MultipartEncoder
+from .common import (
+    __rate_limited_method_prefixes__,
+    __rate_limit_exempt_methods__,
+    __rate_limit_max_retries__,
+    __download_chunk_size__
+    )
+from pathlib import Path
 from traceback import extract_stack
 from concurrent.futures import ThreadPoolExecutor, Future
 
@@ -17,12 +27,16 @@ class _Request(object):
     """
     Request Class
     """
-    def __init__(self, thread_pool_size, url, message_deletor, hide_info, debug=False, proxies={"all": None}):
+    def __init__(self, thread_pool_size, url, message_deletor, hide_info, debug=False, proxies={"all": None},
+                 rate_limiter=None, upload_cache=None, read_cache=None):
         self.__url = url
         self.__message_deletor = message_deletor
         self.__hide_info = hide_info
         self.__debug = debug
         self.__proxies = proxies
+        self.__rate_limiter = rate_limiter
+        self.__upload_cache = upload_cache
+        self.__read_cache = read_cache
 
         self.__session = self.__connection_session(
             pool_connections=thread_pool_size,
@@ -99,16 +113,13 @@ class _Request(object):
 
         data, files = {}, {}
         for key, value in kwargs.items():
-            if isinstance(value, io.BufferedReader):
-                value = value.read()
-
             if not is_inputmedia and key == inputmedia_param_name:
                 pass
             elif is_inputmedia and key == inputmedia_param_name:
                 files = value
             elif isinstance(value, tuple):
                 files[key] = value
-            elif isinstance(value, bytes):
+            elif isinstance(value, (bytes, io.IOBase, mmap.mmap, Path)): # Streamed from files
                 files[key] = value
             elif isinstance(value, dict):
                 data[key] = json.dumps(value)
@@ -119,6 +130,9 @@ class _Request(object):
 
         # print(data, "\n", files)
         url = f'{self.__url}{method_name}'
+        if self.__read_cache is not None and not run_in_thread and self.__read_cache.cacheable(method_name):
+            return self.__read_cache.load(method_name, data,
+                lambda: self.__requestFunc(method_name, url, data, files, del_msg_after))
         if run_in_thread:
             try:
                 if self.__thread_pool._work_queue.qsize() >= self.__thread_pool._max_workers:
@@ -129,7 +143,7 @@ class _Request(object):
                     self.__requestFunc, method_name, url, data, files, del_msg_after)
                 fur.add_done_callback(self.__threadpool_exception)
 
-                return True
+                return fur
             except Exception as e:
                 _logger.error(f"Error executing method {method_name}:", str(e))
                 traceback.print_exc()
@@ -145,12 +159,48 @@ class _Request(object):
             )
 
     def __requestFunc(self, method_name, url, data, files, del_msg_after):
+        rate_limited = self.__rate_limiter is not None \
+            and method_name.startswith(__rate_limited_method_prefixes__) \
+            and method_name not in __rate_limit_exempt_methods__
+        body, headers, pending = None, None, {}
         try:
-            with self.__session.post(url=url, data=data, files=files) as req:
-                data = req.json()
-                self.__debug_info(method_name, data)
-                if data.get("ok", False):
-                    result = data.get("result")
+            if self.__upload_cache is not None and files:
+                pending = self.__upload_cache.substitute(method_name, data, files)
+
+            for retries in range(__rate_limit_max_retries__ + 1):
+                if rate_limited:
+                    delay = self.__rate_limiter.reserve(data.get("chat_id"))
+                    if delay > 0:
+                        time.sleep(delay)
+
+                if files:
+                    if body is None:
+                        body = _MultipartEncoder(data, files)
+                        headers = {"Content-Type": body.content_type}
+                    body.seek(0)
+                with self.__session.post(url=url, data=body.body() if files else data,
+                                         headers=headers if files else None) as req:
+                    response = req.json()
+
+                if rate_limited and response.get("error_code") == 429 \
+                    and retries < __rate_limit_max_retries__:
+                    retry_after = response.get("parameters", {}).get("retry_after", 1)
+                    if not self.__hide_info:
+                        _logger.warn(f"Method {method_name} is rate limited: retry after {retry_after}s.")
+                    self.__rate_limiter.penalize(data.get("chat_id"), retry_after)
+                    continue
+
+                if not response.get("ok", False) and pending and retries < __rate_limit_max_retries__ \
+                    and self.__upload_cache.forget(pending, data, files):
+                    continue # A cached file_id is rejected, upload the files again
+
+                self.__debug_info(method_name, response)
+                if response.get("ok", False):
+                    result = response.get("result")
+                    if pending:
+                        self.__upload_cache.learn(pending, result)
+                    if self.__read_cache is not None:
+                        self.__read_cache.written(method_name, data)
 
                     if del_msg_after >= 0:
                         if isinstance(result, dict) \
@@ -168,14 +218,37 @@ class _Request(object):
 
                     return result
                 else:
-                    return data.get("ok")
+                    return response.get("ok")
         except Exception as e:
             _logger.error(f"Error executing method {method_name}:", str(e))
             traceback.print_exc()
             return False
+        finally:
+            if isinstance(body, _MultipartEncoder):
+                body.close()
+
+    def stream(self, url, start=0, chunk_size=__download_chunk_size__):
+        """
+        Download in chunks over the connection pool, from byte start on
+        """
+        headers = {"Range": f"bytes={start}-"} if start > 0 else None
+        with self.__session.get(url=url, headers=headers, stream=True, timeout=(30, 300)) as req:
+            if req.status_code == 416: # Nothing left after start
+                return
+            if req.status_code >= 400: # Without the url, it contains the Bot Key
+                raise requests.HTTPError(f"{req.status_code} {req.reason}", response=req)
+
+            skip = start if req.status_code != 206 else 0 # Range is not supported
+            for chunk in req.iter_content(chunk_size=chunk_size):
+                if skip > 0:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+                    chunk, skip = chunk[skip:], 0
+                yield chunk
 
     def __threadpool_exception(self, fur):
         if fur.exception() is not None:
-            _logger.debug(f"EXCEPTION - {str(fur.result())}")
+            _logger.debug(f"EXCEPTION - {str(fur.exception())}")
 
 
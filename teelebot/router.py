@@ -0,0 +1,115 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import threading
+import traceback
+
+from typing import Tuple
+
+from .logger import _logger
+
+
+class _Router(object):
+    """
+    Router Class
+    """
+    def __init__(self, plugin_bridge={}):
+        self.__router_mutex = threading.RLock()
+        self.__root = ({}, [])
+        self.__routes = {}
+        self.__lookups = 0
+        self.__unmatched = 0
+        self.__matches = {}
+        self.__since = {}
+
+        self.compile(plugin_bridge)
+
+    def compile(self, plugin_bridge: dict) -> bool:
+        """
+        Compile the commands of the plugin bridge into a prefix trie
+        """
+        root = ({}, [])
+        for order, (plugin, command) in enumerate(plugin_bridge.items()):
+            if command is None:
+                command = ""
+            node = root
+            for char in command:
+                node = node[0].setdefault(char, ({}, []))
+            node[1].append((order, plugin, command in ["", " "]))
+
+        with self.__router_mutex:
+            for plugin in plugin_bridge.keys():
+                if plugin not in self.__matches or \
+                    self.__routes.get(plugin) != plugin_bridge[plugin]:
+                    self.__matches[plugin] = 0
+                    self.__since[plugin] = self.__lookups
+            for plugin in list(self.__matches.keys()):
+                if plugin not in plugin_bridge.keys():
+                    self.__matches.pop(plugin)
+                    self.__since.pop(plugin)
+
+            self.__routes = dict(plugin_bridge)
+            self.__root = root
+
+        return True
+
+    def match(self, text: str, skip_blank: bool = False) -> list:
+        """
+        Get the plugins whose command is a prefix of the text,
+        in the order of the plugin bridge
+        """
+        if not isinstance(text, str):
+            return []
+
+        node = self.__root
+        matched = list(node[1])
+        for char in text:
+            node = node[0].get(char)
+            if node is None:
+                break
+            if node[1]:
+                matched.extend(node[1])
+
+        if skip_blank:
+            matched = [route for route in matched if not route[2]]
+        if len(matched) > 1:
+            matched.sort()
+        plugins = [route[1] for route in matched]
+
+        with self.__router_mutex:
+            self.__lookups += 1
+            if not plugins:
+                self.__unmatched += 1
+            for plugin in plugins:
+                if plugin in self.__matches:
+                    self.__matches[plugin] += 1
+
+        return plugins
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the match and miss counts of every route
+        """
+        try:
+            with self.__router_mutex:
+                routes = {}
+                for plugin, command in self.__routes.items():
+                    matches = self.__matches[plugin]
+                    routes[plugin] = {
+                        "command": command,
+                        "matches": matches,
+                        "misses": self.__lookups - self.__since[plugin] - matches
+                    }
+
+                result = {
+                    "lookups": self.__lookups,
+                    "unmatched": self.__unmatched,
+                    "routes": routes
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
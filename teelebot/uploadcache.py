@@ -0,0 +1,182 @@
+# -*- coding:utf-8 -*-
+'''
+@creation date: 2026-10-18
+@last modification: 2026-10-18
+'''
+import io
+import os
+import mmap
+import json
+import hashlib
+import threading
+import traceback
+
+from pathlib import Path
+from collections import OrderedDict
+from typing import Tuple
+
+from .logger import _logger
+from .common import __upload_cache_fields__
+
+
+class _UploadCache(object):
+    """
+    Upload Cache Class,
+    file_id of uploaded media by content hash, or by path, mtime and size of files,
+    least recently used entries are evicted and the index is kept on disk
+    """
+    def __init__(self, index_path, size=1024):
+        self.__index_path = index_path
+        self.__size = size
+        self.__upload_cache_mutex = threading.RLock()
+        self.__file_ids = OrderedDict() # cache key -> file_id
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+        try:
+            if os.path.isfile(self.__index_path):
+                with open(self.__index_path, "r", encoding="utf-8") as f:
+                    self.__file_ids.update(json.load(f))
+                while len(self.__file_ids) > self.__size:
+                    self.__file_ids.popitem(last=False)
+        except Exception as e:
+            _logger.warn(f"Upload cache index is ignored: {str(e)}")
+
+    def __del__(self):
+        del self.__file_ids
+
+    def substitute(self, method_name, data, files) -> dict:
+        """
+        Replace the cached files of a send method with their file_id in data,
+        return the pending fields as {field: (cache key, file, substituted file_id or None)}
+        """
+        pending = {}
+        if not method_name.startswith("send") or method_name == "sendMediaGroup":
+            return pending
+
+        for field in list(files.keys()):
+            if field not in __upload_cache_fields__:
+                continue
+            key = self.__key(field, files[field])
+            if key is None:
+                continue
+
+            with self.__upload_cache_mutex:
+                file_id = self.__file_ids.get(key)
+                if file_id is None:
+                    self.__misses += 1
+                else:
+                    self.__file_ids.move_to_end(key)
+                    self.__hits += 1
+
+            pending[field] = (key, files[field], file_id)
+            if file_id is not None:
+                data[field] = file_id
+                del files[field]
+
+        return pending
+
+    def learn(self, pending, result) -> bool:
+        """
+        Remember the file_id of the files uploaded by a successful send
+        """
+        if not isinstance(result, dict):
+            return False
+
+        learned = False
+        for field, (key, file, file_id) in pending.items():
+            if file_id is not None:
+                continue
+            media = result.get(field)
+            if isinstance(media, list) and len(media) != 0: # Photo sizes, the largest is last
+                media = media[-1]
+            if not isinstance(media, dict) or "file_id" not in media:
+                continue
+
+            with self.__upload_cache_mutex:
+                self.__file_ids[key] = media["file_id"]
+                self.__file_ids.move_to_end(key)
+                while len(self.__file_ids) > self.__size:
+                    self.__file_ids.popitem(last=False)
+                    self.__evictions += 1
+            learned = True
+
+        if learned:
+            self.__save()
+        return learned
+
+    def forget(self, pending, data, files) -> bool:
+        """
+        Drop the file_id of a failed send and put the files back to upload them again,
+        return whether a file_id was substituted
+        """
+        forgotten = False
+        for field, (key, file, file_id) in pending.items():
+            if file_id is None:
+                continue
+            with self.__upload_cache_mutex:
+                if self.__file_ids.get(key) == file_id:
+                    del self.__file_ids[key]
+            data.pop(field, None)
+            files[field] = file
+            pending[field] = (key, file, None) # Learn the file_id of the new upload
+            forgotten = True
+
+        if forgotten:
+            self.__save()
+        return forgotten
+
+    def status(self) -> Tuple[bool, dict]:
+        """
+        Get the number of cached file_id, hits, misses and evictions
+        """
+        try:
+            with self.__upload_cache_mutex:
+                result = {
+                    "size": len(self.__file_ids),
+                    "max_size": self.__size,
+                    "hits": self.__hits,
+                    "misses": self.__misses,
+                    "evictions": self.__evictions
+                }
+            return True, result
+        except Exception as e:
+            _logger.error(str(e))
+            traceback.print_exc()
+            return False, {"exception": e}
+
+    def __key(self, field, value):
+        filename = ""
+        if isinstance(value, tuple): # (filename, content[, content_type])
+            filename, value = str(value[0]), value[1]
+
+        if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+            return f"{field}:{filename}:sha256:{hashlib.sha256(value).hexdigest()}"
+
+        if isinstance(value, Path):
+            path, position = value, 0
+        elif isinstance(value, io.IOBase) and isinstance(getattr(value, "name", None), str):
+            try:
+                path, position = Path(value.name), value.tell()
+            except (OSError, io.UnsupportedOperation):
+                return None
+        else:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return f"{field}:{filename}:path:{os.path.realpath(path)}:{stat.st_mtime_ns}:{stat.st_size}:{position}"
+
+    def __save(self):
+        temp_path = f"{self.__index_path}.tmp"
+        try:
+            with self.__upload_cache_mutex:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.__file_ids, f)
+                os.replace(temp_path, self.__index_path)
+        except Exception as e:
+            _logger.error(f"Failed to save the upload cache index: {str(e)}")
@@ -1,49 +1,61 @@
 # -*- coding:utf-8 -*-
 '''
 @creation date: 2020-6-12
-@last modification: 2023-12-11
+@last modification: 2026-10-18
 '''
-#from socketserver import ThreadingMixIn
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
 import ssl
 import os
 import json
+import hmac
+import queue
+import threading
+import traceback
 
 from .logger import _logger
 
 
-def __MakeRequestHandler(bot):
+def __MakeRequestHandler(bot, updates):
     class RequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # Keep-alive, Telegram reuses its connections
+        timeout = 60 # Close idle connections so they do not hold a worker
+        disable_nagle_algorithm = True
+        queue_timeout = 1 # Seconds to wait for room in a full update queue
+
         def __init__(self, *args, **kwargs):
             super(RequestHandler, self).__init__(*args, **kwargs)
 
         def do_POST(self):
+            secret_token = str(self.headers['X-Telegram-Bot-Api-Secret-Token'])
             if self.command == "POST" and \
             self.path == "/bot" + str(bot._key) and \
-            str(self.headers['X-Telegram-Bot-Api-Secret-Token']) == bot._secret_token:
-                req_data = self.rfile.read(int(self.headers['content-length']))
-                res = req_data.decode('utf-8')
-
-                message = json.loads(res)
-                results = [message]
-                messages = bot._washUpdates(results)
-                if messages is not None and messages:
-                    for message in messages:
-                        bot._pluginRun(bot, message)
-
-                data = {'status': 'ok'}
-                data = json.dumps(data)
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(data.encode('utf-8'))
-            else:
-                data = {'status': 'false'}
-                data = json.dumps(data)
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(data.encode('utf-8'))
+            hmac.compare_digest(secret_token.encode('utf-8'), str(bot._secret_token).encode('utf-8')):
+                try:
+                    req_data = self.rfile.read(int(self.headers['content-length']))
+                    update = json.loads(req_data.decode('utf-8'))
+                except (TypeError, ValueError): # The rest of the body is unknown, do not reuse the connection
+                    self.__reply(400, {'status': 'false'}, {'Connection': 'close'})
+                    return
+
+                try:
+                    updates.put(update, timeout=self.queue_timeout) # Acknowledge at once, plugins run in the background
+                except queue.Full: # Telegram sends the update again later
+                    self.__reply(429, {'status': 'false'}, {'Retry-After': '1'})
+                    return
+                self.__reply(200, {'status': 'ok'})
+            else: # The body is not read, do not reuse the connection
+                self.__reply(400, {'status': 'false'}, {'Connection': 'close'})
+
+        def __reply(self, code, data, headers={}):
+            data = json.dumps(data).encode('utf-8')
+            self.send_response(code)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
 
         def log_message(self, format, *args):
             pass
@@ -51,8 +63,55 @@ def __MakeRequestHandler(bot):
     return RequestHandler
 
 
-# class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-#     pass
+class _WebhookServer(HTTPServer):
+    """
+    HTTP server handling each connection on a bounded thread pool
+    """
+    request_queue_size = 128
+
+    def __init__(self, server_address, RequestHandlerClass, workers):
+        super(_WebhookServer, self).__init__(server_address, RequestHandlerClass)
+        self.__thread_pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="WebhookWorker")
+
+    def process_request(self, request, client_address):
+        self.__thread_pool.submit(self.__process_request, request, client_address)
+
+    def __process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        _logger.debug(f"EXCEPTION - webhook connection from {client_address[0]} failed")
+
+    def server_close(self):
+        super(_WebhookServer, self).server_close()
+        self.__thread_pool.shutdown(wait=False)
+
+
+def __consumeUpdates(bot, updates):
+    """
+    Dispatch the received updates, everything queued meanwhile forms one page
+    """
+    while True:
+        results = [updates.get()]
+        while len(results) < 100:
+            try:
+                results.append(updates.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            messages = bot._washUpdates(results)
+            if messages is not None and messages:
+                bot._pluginRunBatch(bot, messages)
+        except Exception as e:
+            _logger.error(f"Failed to dispatch webhook updates: {str(e)}")
+            traceback.print_exc()
 
 
 def _runWebhook(bot, host, port):
@@ -61,24 +120,22 @@ def _runWebhook(bot, host, port):
     bot._update_plugins_init_status()
     bot._plugins_init(bot)
 
-    RequestHandler = __MakeRequestHandler(bot)
+    updates = queue.Queue(maxsize=bot._webhook_workers * 100) # Full while the dispatcher is blocked
+    consumer = threading.Thread(target=__consumeUpdates, args=(bot, updates),
+        name="WebhookConsumer", daemon=True)
+    consumer.start()
+
+    RequestHandler = __MakeRequestHandler(bot, updates)
+    server = _WebhookServer((host, port), RequestHandler, bot._webhook_workers)
     if bot._load_cert:
-        try:
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-            context.load_cert_chain(bot._cert_pub, bot._cert_key)
-
-            server = HTTPServer((host, port), RequestHandler)
-            server.socket = context.wrap_socket(server.socket, server_side=True)
-            server.serve_forever()
-        except KeyboardInterrupt:
-            server.server_close()
-            _logger.info("Bot Exit.")
-            os._exit(0)
-    else:
-        try:
-            server = HTTPServer((host, port), RequestHandler)
-            server.serve_forever()
-        except KeyboardInterrupt:
-            server.server_close()
-            _logger.info("Bot Exit.")
-            os._exit(0)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(bot._cert_pub, bot._cert_key)
+        server.socket = context.wrap_socket(server.socket, server_side=True,
+            do_handshake_on_connect=False) # Handshake in the worker, not in the accept loop
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+        _logger.info("Bot Exit.")
+        os._exit(0)
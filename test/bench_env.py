@@ -0,0 +1,52 @@
+# -*- coding:utf-8 -*-
+"""
+Setup shared by the benchmarks: a config and a plugin dir in a temporary
+directory, with the command line arguments teelebot reads on import.
+"""
+import os
+import sys
+
+
+METADATA = """Metadata-version: 1.1
+Plugin-name: {name}
+Command: /{name}
+Buffer-permissions: True:True
+Version: 0.1.0
+Summary: Benchmark plugin
+Home-page:
+Author:
+Author-email:
+License:
+Keywords:
+Requires-teelebot: >=2.3.0
+Requires-dist:
+Source:
+"""
+
+
+def setup(workdir, plugins=(), **config):
+    """
+    Write a config and plugins granting each other buffer access,
+    point teelebot at the config, return the plugin dir,
+    config items are written to the config besides the defaults
+    """
+    plugin_dir = os.path.join(workdir, "plugins") + os.sep
+    os.makedirs(plugin_dir, exist_ok=True)
+    for name in plugins:
+        os.makedirs(os.path.join(plugin_dir, name), exist_ok=True)
+        with open(os.path.join(plugin_dir, name, "METADATA"), "w") as f:
+            f.write(METADATA.format(name=name))
+        with open(os.path.join(plugin_dir, name, f"{name}.py"), "w") as f:
+            f.write(f"def {name}(bot, message):\n    pass\n")
+
+    items = {"key": "123456:bench", "root_id": 1, "plugin_dir": plugin_dir,
+             "webhook": False, "debug": False, "hide_info": True}
+    items.update(config)
+    path = os.path.join(workdir, "config.cfg")
+    with open(path, "w") as f:
+        f.write("[config]\n" + "".join(f"{key}={value}\n" for key, value in items.items()))
+
+    sys.argv = [sys.argv[0], "-c", path, "-hi"]
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    return plugin_dir
@@ -0,0 +1,233 @@
+# -*- coding:utf-8 -*-
+"""
+Benchmarks of the plugin data buffer, run against a temporary plugin dir.
+
+size: insert latency while the buffer fills up to buffer_size MB, next to
+the cost of the recursive size walk over the whole buffer that inserts used
+to make at the same fill level.
+
+index: select, update and delete by conditions on a buffer with indexes
+on the condition fields and on one without, at --records records.
+
+contention: --workers threads running a mix of inserts, selects, updates
+and deletes on the buffers of --plugins plugins, reported in ops/sec, once
+with a lock per plugin and once with one lock shared by all plugins.
+
+frozen: latency and allocated memory of selects from a frozen buffer area,
+which returns its read-only records, and from one returning deep copies,
+at --records records.
+
+python buffer_bench.py size --buffer-size 16
+python buffer_bench.py index --records 100000
+python buffer_bench.py contention --workers 32 --plugins 16
+python buffer_bench.py frozen --records 10000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+import tracemalloc
+
+from bench_env import setup
+
+
+def bench_size(args, workdir):
+    plugin_dir = setup(workdir, ["Bench"])
+    from teelebot.buffer import _Buffer
+
+    buffer_size = args.buffer_size * 1024 * 1024
+    buffer = _Buffer(buffer_size, ["Bench"], plugin_dir)
+    record = {"user_id": 0, "chat_id": -100, "count": 0, "text": "x" * 64}
+
+    print(f"buffer_size: {args.buffer_size}MB")
+    print(f"{'fill':>5} {'records':>8} {'insert p50':>11} {'insert p99':>11} {'status':>9} {'size walk':>10}")
+    samples, level = [], 1
+    while True:
+        record["user_id"] += 1
+        start = time.perf_counter()
+        ok, _ = buffer.insert("Bench", "default", record)
+        samples.append(time.perf_counter() - start)
+        if not ok:
+            break
+
+        ok, status = buffer.status()
+        if status["used"] >= buffer_size * level / 10:
+            start = time.perf_counter()
+            buffer.status()
+            status_time = time.perf_counter() - start
+            start = time.perf_counter()
+            buffer._Buffer__total_size({plugin_name: {buffer_name: area.records
+                for buffer_name, area in areas.items()}
+                for plugin_name, areas in buffer._Buffer__buffer.items()})
+            walk_time = time.perf_counter() - start
+
+            samples.sort()
+            count = buffer.show("Bench")[1]["default"]["count"]
+            print(f"{level * 10:>4}% {count:>8} {statistics.median(samples) * 1e6:>9.1f}us " +
+                  f"{samples[int(len(samples) * 0.99)] * 1e6:>9.1f}us {status_time * 1e6:>7.1f}us " +
+                  f"{walk_time * 1e3:>8.1f}ms")
+            samples, level = [], level + 1
+
+
+def bench_index(args, workdir):
+    plugin_dir = setup(workdir, ["Bench"])
+    from teelebot.buffer import _Buffer
+
+    buffer = _Buffer(1024 * 1024 * 1024, ["Bench"], plugin_dir)
+    buffer.create("Bench", "indexed", indexes=["user_id", "date"])
+    buffer.create("Bench", "plain")
+
+    users = args.records // 10
+    rand = random.Random(0)
+    for date in range(args.records):
+        record = {"user_id": rand.randrange(users), "chat_id": -100, "date": date, "count": 0}
+        buffer.insert("Bench", "indexed", record)
+        buffer.insert("Bench", "plain", record)
+
+    def user(i):
+        return {"user_id": rand.randrange(users)}
+
+    def recent(i):
+        return {"date": {"$gte": args.records - 100}}
+
+    def window(i):
+        start = rand.randrange(args.records - 1000)
+        return {"user_id": rand.randrange(users), "date": {"$gte": start, "$lt": start + 1000}}
+
+    operations = [
+        ("select user_id", lambda area, i: buffer.select("Bench", area, conditions=user(i))),
+        ("select date range", lambda area, i: buffer.select("Bench", area, conditions=recent(i))),
+        ("select user+range", lambda area, i: buffer.select("Bench", area, conditions=window(i))),
+        ("update user_id", lambda area, i: buffer.update("Bench", area, conditions=user(i),
+            data={"count": i})),
+        ("delete user_id", lambda area, i: buffer.delete("Bench", area, conditions=user(i)))
+    ]
+
+    print(f"records: {args.records}  users: {users}")
+    print(f"{'operation':>18} {'indexed':>10} {'plain':>10}")
+    for name, operation in operations:
+        times = []
+        for area in ["indexed", "plain"]:
+            rand.seed(1)
+            calls = 20 if area == "plain" else 1000
+            start = time.perf_counter()
+            for i in range(calls):
+                operation(area, i)
+            times.append((time.perf_counter() - start) / calls)
+        print(f"{name:>18} {times[0] * 1e6:>8.1f}us {times[1] * 1e6:>8.1f}us")
+
+
+def bench_contention(args, workdir):
+    plugins = [f"Bench{i}" for i in range(args.plugins)]
+    plugin_dir = setup(workdir, plugins)
+    from teelebot.buffer import _Buffer
+
+    def worker(buffer, index, barrier, counts):
+        plugin_name = plugins[index % len(plugins)]
+        rand = random.Random(index)
+        operations = 0
+        barrier.wait()
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            user_id = rand.randrange(100)
+            op = rand.random()
+            if op < 0.15:
+                buffer.insert(plugin_name, "flood", {"user_id": user_id, "worker": index, "count": 0})
+            elif op < 0.65:
+                buffer.select(plugin_name, "flood", conditions={"user_id": user_id, "worker": index})
+            elif op < 0.9:
+                buffer.update(plugin_name, "flood", conditions={"user_id": user_id, "worker": index},
+                    data={"count": operations})
+            else:
+                buffer.delete(plugin_name, "flood", conditions={"user_id": user_id, "worker": index})
+            operations += 1
+        counts[index] = operations
+
+    print(f"workers: {args.workers}  plugins: {args.plugins}  seconds: {args.seconds}")
+    for locking in ["per plugin", "shared"]:
+        buffer = _Buffer(256 * 1024 * 1024, plugins, plugin_dir)
+        mutexes = getattr(buffer, "_Buffer__plugin_mutexes", None)
+        if locking == "shared":
+            if mutexes is None:
+                continue
+            shared = threading.RLock()
+            for plugin_name in plugins:
+                mutexes[plugin_name] = shared
+        for plugin_name in plugins:
+            buffer.create(plugin_name, "flood", indexes=["user_id"])
+
+        barrier = threading.Barrier(args.workers)
+        counts = [0] * args.workers
+        workers = [threading.Thread(target=worker, args=(buffer, i, barrier, counts))
+                   for i in range(args.workers)]
+        for worker_thread in workers:
+            worker_thread.start()
+        for worker_thread in workers:
+            worker_thread.join()
+
+        print(f"{locking if mutexes is not None else 'global':>10}: {sum(counts) / args.seconds:>9.0f} ops/sec")
+
+
+def bench_frozen(args, workdir):
+    plugin_dir = setup(workdir, ["Bench"])
+    from teelebot.buffer import _Buffer
+
+    buffer = _Buffer(1024 * 1024 * 1024, ["Bench"], plugin_dir)
+    buffer.create("Bench", "frozen", indexes=["user_id"], frozen=True)
+    buffer.create("Bench", "copied", indexes=["user_id"])
+
+    users = max(args.records // 10, 1)
+    rand = random.Random(0)
+    for date in range(args.records):
+        record = {"user_id": rand.randrange(users), "chat_id": -100, "date": date,
+                  "history": [rand.randrange(1000) for _ in range(10)],
+                  "user": {"first_name": "bench", "language_code": "en", "is_bot": False}}
+        buffer.insert("Bench", "frozen", record)
+        buffer.insert("Bench", "copied", record)
+
+    operations = [
+        ("select idx", 10000, lambda area, i: buffer.select("Bench", area, idx=i % args.records)),
+        ("select user_id", 10000, lambda area, i: buffer.select("Bench", area,
+            conditions={"user_id": i % users})),
+        ("select all", 10, lambda area, i: buffer.select("Bench", area))
+    ]
+
+    print(f"records: {args.records}  users: {users}")
+    print(f"{'operation':>15} {'frozen':>10} {'copied':>10} {'frozen alloc':>13} {'copied alloc':>13}")
+    for name, calls, operation in operations:
+        times, allocated = [], []
+        for area in ["frozen", "copied"]:
+            start = time.perf_counter()
+            for i in range(calls):
+                operation(area, i)
+            times.append((time.perf_counter() - start) / calls)
+
+            tracemalloc.start()
+            operation(area, 0)
+            allocated.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        print(f"{name:>15} {times[0] * 1e6:>8.1f}us {times[1] * 1e6:>8.1f}us " +
+              f"{allocated[0] / 1024:>11.1f}KB {allocated[1] / 1024:>11.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="teelebot buffer benchmarks")
+    parser.add_argument("bench", choices=["size", "index", "contention", "frozen"], help="benchmark to run")
+    parser.add_argument("--buffer-size", type=int, default=16, help="buffer size in MB")
+    parser.add_argument("--records", type=int, default=100000, help="records of the index and frozen benchmarks")
+    parser.add_argument("--workers", type=int, default=32, help="threads of the contention benchmark")
+    parser.add_argument("--plugins", type=int, default=16, help="plugins of the contention benchmark")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of the contention benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        globals()[f"bench_{args.bench}"](args, workdir)
+
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
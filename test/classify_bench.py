@@ -0,0 +1,274 @@
+# -*- coding:utf-8 -*-
+"""
+Classification benchmark of updates: the former if/elif chains of
+_washUpdates and __mark_message_for_pluginRun next to the precomputed
+tables, over a recorded set of update shapes. Reported per kind of update
+for the classification of a washed message, and for washing plus tagging
+a page of updates of every kind.
+
+python classify_bench.py --rounds 20000 --repeats 10
+"""
+import os
+import gc
+import copy
+import time
+import argparse
+import tempfile
+
+from bench_env import setup
+
+
+USER = {"id": 1, "is_bot": False, "first_name": "Bench", "username": "bench", "language_code": "en"}
+GROUP = {"id": -100, "title": "Bench", "type": "supergroup"}
+
+
+def message(**fields):
+    message = {"message_id": 1, "from": dict(USER), "chat": dict(GROUP), "date": 0}
+    message.update(fields)
+    return message
+
+
+UPDATES = {
+    "text": {"message": message(text="/start")},
+    "caption": {"message": message(caption="caption")},
+    "photo": {"message": message(photo=[{"file_id": "a", "width": 90, "height": 90}], caption="photo")},
+    "sticker": {"message": message(sticker={"file_id": "a", "emoji": "x"})},
+    "document": {"message": message(document={"file_id": "a", "file_name": "a.txt"})},
+    "location": {"message": message(location={"latitude": 0.0, "longitude": 0.0})},
+    "new_chat_members": {"message": message(new_chat_members=[dict(USER)])},
+    "left_chat_member": {"message": message(left_chat_member=dict(USER))},
+    "edited_message": {"edited_message": message(text="edited", edit_date=1)},
+    "callback_query": {"callback_query": {"id": "1", "from": dict(USER), "data": "page:2",
+                                          "message": message(text="menu")}},
+    "inline_query": {"inline_query": {"id": "1", "from": dict(USER), "query": "search", "offset": ""}},
+    "my_chat_member": {"my_chat_member": {"chat": dict(GROUP), "from": dict(USER), "date": 0,
+                                          "old_chat_member": {"status": "left", "user": dict(USER)},
+                                          "new_chat_member": {"status": "member", "user": dict(USER)}}},
+    "chat_member": {"chat_member": {"chat": dict(GROUP), "from": dict(USER), "date": 0,
+                                    "old_chat_member": {"status": "left", "user": dict(USER)},
+                                    "new_chat_member": {"status": "member", "user": dict(USER)}}},
+    "chat_join_request": {"chat_join_request": {"chat": dict(GROUP), "from": dict(USER),
+                                                "user_chat_id": 1, "date": 0}}
+}
+
+
+def former_wash(results, inline_mode_prefix=""):
+    """
+    Bot._washUpdates before the tables
+    """
+    if not results:
+        return False
+    elif len(results) < 1:
+        return None
+    update_ids = []
+    messages = []
+    for result in results:
+        if "update_id" not in result.keys():
+            return None
+        update_ids.append(result.get("update_id"))
+        query_or_message = ""
+        if result.get("inline_query"):
+            query_or_message = "inline_query"
+        elif result.get("callback_query"):
+            query_or_message = "callback_query"
+        elif result.get("my_chat_member"):
+            query_or_message = "my_chat_member"
+        elif result.get("chat_member"):
+            query_or_message = "chat_member"
+        elif result.get("chat_join_request"):
+            query_or_message = "chat_join_request"
+        elif result.get("edited_message"):
+            query_or_message = "edited_message"
+        elif result.get("message"):
+            query_or_message = "message"
+
+        if query_or_message == "inline_query":
+            inline_query = result.get(query_or_message)
+            inline_query["update_id"] = result["update_id"]
+            inline_query["message_id"] = result["update_id"]
+            inline_query["chat"] = inline_query.get("from")
+            inline_query["chat"].pop("language_code")
+            inline_query["chat"].pop("is_bot")
+            inline_query["chat"]["type"] = "private"
+            inline_query["text"] = ""
+            inline_query["query"] = f'{inline_mode_prefix}{inline_query["query"]}'
+            messages.append(inline_query)
+        elif query_or_message == "callback_query":
+            callback_query = result.get(query_or_message).get("message")
+            callback_query["update_id"] = result["update_id"]
+            callback_query["click_user"] = result.get(query_or_message)["from"]
+            callback_query["callback_query_id"] = result.get(query_or_message).get("id")
+            callback_query["callback_query_data"] = result.get(query_or_message).get("data")
+            messages.append(callback_query)
+        elif query_or_message in ["my_chat_member", "chat_member", "chat_join_request"]:
+            member_update = result.get(query_or_message)
+            member_update["update_id"] = result["update_id"]
+            member_update["message_id"] = result.get("update_id")
+            member_update[f"{query_or_message}_id"] = result.get("update_id")
+            messages.append(member_update)
+        else:
+            message_dict = result.get(query_or_message)
+            if isinstance(message_dict, dict):
+                message_dict["update_id"] = result["update_id"]
+            messages.append(message_dict)
+
+    if len(update_ids) >= 1:
+        max(update_ids) + 1 # The offset
+        return messages
+    else:
+        return None
+
+
+def former_mark(message):
+    """
+    Bot.__mark_message_for_pluginRun before the tables
+    """
+    if "callback_query_id" in message.keys():
+        message["message_type"] = "callback_query_data"
+        message_type = "callback_query_data"
+    elif "query" in message.keys():
+        message["message_type"] = "inline_query"
+        message_type = "query"
+    elif "voice_chat_started" in message.keys():
+        message["message_type"] = "voice_started"
+        message_type = "voice_started"
+        message["voice_started"] = ""
+    elif "voice_chat_ended" in message.keys():
+        message["message_type"] = "voice_ended"
+        message_type = "voice_ended"
+        message["voice_ended"] = ""
+    elif "voice_chat_participants_invited" in message.keys():
+        message["message_type"] = "voice_invited"
+        message_type = "voice_invited"
+        message["voice_invited"] = ""
+    elif "message_auto_delete_timer_changed" in message.keys():
+        message["message_type"] = "message__timer_changed"
+        message_type = "message__timer_changed"
+        message["message__timer_changed"] = ""
+    elif "my_chat_member_id" in message.keys():
+        message["message_type"] = "my_chat_member_data"
+        message_type = "my_chat_member_data"
+        message["my_chat_member_data"] = ""
+    elif "chat_member_id" in message.keys():
+        message["message_type"] = "chat_member_data"
+        message_type = "chat_member_data"
+        message["chat_member_data"] = ""
+    elif "chat_join_request_id" in message.keys():
+        message["message_type"] = "chat_join_request_data"
+        message_type = "chat_join_request_data"
+        message["chat_join_request_data"] = ""
+    elif "new_chat_members" in message.keys():
+        message["message_type"] = "chat_members"
+        message_type = "chat_members"
+        message["chat_members"] = ""
+    elif "left_chat_member" in message.keys():
+        message["message_type"] = "left_member"
+        message_type = "left_member"
+        message["left_member"] = ""
+    elif "photo" in message.keys():
+        message["message_type"] = "photo"
+        message_type = "message_type"
+    elif "sticker" in message.keys():
+        message["message_type"] = "sticker"
+        message_type = "message_type"
+    elif "video" in message.keys():
+        message["message_type"] = "video"
+        message_type = "message_type"
+    elif "audio" in message.keys():
+        message["message_type"] = "audio"
+        message_type = "message_type"
+    elif "document" in message.keys():
+        message["message_type"] = "document"
+        message_type = "message_type"
+    elif "contact" in message.keys():
+        message["message_type"] = "contact"
+        message_type = "message_type"
+    elif "dice" in message.keys():
+        message["message_type"] = "dice"
+        message_type = "message_type"
+    elif "game" in message.keys():
+        message["message_type"] = "game"
+        message_type = "message_type"
+    elif "poll" in message.keys():
+        message["message_type"] = "poll"
+        message_type = "message_type"
+    elif "venue" in message.keys():
+        message["message_type"] = "venue"
+        message_type = "message_type"
+    elif "location" in message.keys():
+        message["message_type"] = "location"
+        message_type = "message_type"
+    elif "invoice" in message.keys():
+        message["message_type"] = "invoice"
+        message_type = "message_type"
+    elif "text" in message.keys():
+        message["message_type"] = "text"
+        message_type = "text"
+    elif "caption" in message.keys():
+        message["message_type"] = "caption"
+        message_type = "caption"
+    else:
+        message["message_type"] = "unknown"
+        message_type = "unknown"
+
+    return message_type, message
+
+
+def updates(kinds, rounds):
+    """
+    Fresh copies of the recorded updates, washing changes them
+    """
+    return [[dict(copy.deepcopy(UPDATES[kind]), update_id=update_id)
+             for update_id, kind in enumerate(kinds)] for _ in range(rounds)]
+
+
+def timed(items, function):
+    gc.disable()
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="teelebot update classification benchmark")
+    parser.add_argument("--rounds", type=int, default=20000, help="updates of each kind")
+    parser.add_argument("--repeats", type=int, default=10, help="runs of each measurement, the fastest counts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        setup(workdir)
+        from teelebot import bot
+    mark = bot._Bot__mark_message_for_pluginRun
+
+    print(f"rounds: {args.rounds}")
+    print(f"{'classify':>18} {'former':>9} {'tables':>9}")
+    for kind in UPDATES.keys():
+        times = []
+        messages = [former_wash(page)[0] for page in updates([kind], args.rounds)]
+        for _ in range(args.repeats): # Interleaved against drifts of the clock
+            for classify in [former_mark, mark]:
+                for message in messages:
+                    message.pop("message_type", None)
+                times.append(timed(messages, classify) / args.rounds)
+        times = [min(times[0::2]), min(times[1::2])]
+        print(f"{kind:>18} {times[0] * 1e9:>7.0f}ns {times[1] * 1e9:>7.0f}ns")
+
+    kinds = list(UPDATES.keys())
+    pages = args.rounds // 10
+    former, tables = [], []
+    for _ in range(args.repeats): # Interleaved against drifts of the clock
+        former.append(timed(updates(kinds, pages),
+            lambda page: [former_mark(message) for message in former_wash(page)]))
+        tables.append(timed(updates(kinds, pages), bot._washUpdates))
+    former, tables = min(former), min(tables)
+    total = len(kinds) * pages
+    print(f"{'wash and tag':>18} {former / total * 1e9:>7.0f}ns {tables / total * 1e9:>7.0f}ns")
+
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+"""
+Call overhead benchmark of Bot API methods under concurrent threads:
+the generated methods, the __getattr__ fallback of methods missing from
+the method table and the former dispatch through a shared method name and
+a new bound method per call, which also counts the calls sent to a method
+of another thread. Requests are not sent, the request is replaced by a sink.
+
+python method_bench.py --threads 32 --calls 20000
+"""
+import os
+import time
+import types
+import argparse
+import tempfile
+import threading
+
+from bench_env import setup
+
+
+class Sink(object):
+    def __init__(self):
+        self.wrong = 0
+
+    def postEverything(self, method_name, **kwargs):
+        if kwargs.get("expected", method_name) != method_name:
+            self.wrong += 1
+        return True
+
+
+class FormerDispatch(object):
+    """
+    Bot.__getattr__ before the method table
+    """
+    def __init__(self, request):
+        self.request = request
+        self.__method_name = ""
+
+    def __getattr__(self, method_name):
+        self.__method_name = method_name
+
+        return types.MethodType(self.__method_function, self)
+
+    def __method_function(self, *args, **kwargs):
+        if len(args) != 1:
+            raise TypeError("Method does not accept positional arguments")
+
+        return self.request.postEverything(self.__method_name, **kwargs)
+
+
+def run(threads, calls, call):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        barrier.wait()
+        for _ in range(calls):
+            call(index)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="teelebot method call overhead benchmark")
+    parser.add_argument("--threads", type=int, default=32, help="calling threads")
+    parser.add_argument("--calls", type=int, default=20000, help="calls per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        setup(workdir)
+        from teelebot import bot
+
+    methods = ["sendMessage", "getChat"]
+    fallback_methods = ["sendFutureMessage", "getFutureChat"]
+
+    benches = {}
+    benches["generated"] = (Sink(), lambda i: getattr(bot, methods[i % 2])(chat_id=1))
+    benches["fallback"] = (Sink(), lambda i: getattr(bot, fallback_methods[i % 2])(chat_id=1))
+
+    former = FormerDispatch(Sink())
+    benches["former"] = (former.request, lambda i: getattr(former, methods[i % 2])(
+        chat_id=1, expected=methods[i % 2]))
+
+    total = args.threads * args.calls
+    print(f"threads: {args.threads}  calls: {total}")
+    for name, (sink, call) in benches.items():
+        bot.request = sink
+        elapsed = run(args.threads, args.calls, call)
+        print(f"{name:>9}: {elapsed:.2f}s  {elapsed / total * 1e9:.0f}ns/call  " +
+              f"wrong method: {sink.wrong}")
+
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
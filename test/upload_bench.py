@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+"""
+Memory benchmark of uploads: concurrent sendDocument calls of a large file
+against a local sink standing in for the Bot API, run once with the file
+read into bytes and once with the file object streamed.
+
+python upload_bench.py --size 50 --uploads 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from bench_env import setup
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        remaining = int(self.headers.get("Content-Length") or 0)
+        received = 0
+        if remaining:
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, 1 << 16))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                received += len(chunk)
+        else: # Chunked encoding
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                received += size
+                self.rfile.read(size + 2)
+                if size == 0:
+                    break
+
+        body = json.dumps({"ok": True, "result": {
+            "message_id": 1, "chat": {"id": 1}, "received": received}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def child(args):
+    setup(args.workdir, local_api_server=f"http://127.0.0.1:{args.port}/")
+    from teelebot import bot
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    files = [open(args.file, "rb") for _ in range(args.uploads)]
+    if args.mode == "buffered":
+        documents = [f.read() for f in files]
+    else:
+        documents = files
+
+    start = time.perf_counter()
+    futures = [bot.sendDocument(chat_id=1, document=document, run_in_thread=True)
+               for document in documents]
+    results = bot.gather(futures)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    received = sum(result["received"] for result in results if result)
+    print(json.dumps({"mode": args.mode, "elapsed": elapsed, "baseline_kb": baseline,
+                      "peak_kb": peak, "received": received}))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="teelebot upload memory benchmark")
+    parser.add_argument("--size", type=int, default=50, help="file size in MB")
+    parser.add_argument("--uploads", type=int, default=8, help="concurrent uploads")
+    parser.add_argument("--mode", choices=["buffered", "streamed"], help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        return child(args)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SinkHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "document.bin")
+        with open(path, "wb") as f:
+            for _ in range(args.size):
+                f.write(os.urandom(1024 * 1024))
+
+        print(f"uploads: {args.uploads}  file: {args.size}MB")
+        for mode in ["buffered", "streamed"]:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode,
+                "--file", path, "--port", str(server.server_address[1]), "--workdir", workdir,
+                "--uploads", str(args.uploads)], capture_output=True, text=True)
+            lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+            if not lines:
+                print(mode, "failed:", output.stderr[-2000:])
+                continue
+            result = json.loads(lines[-1])
+            print(f"{mode:>8}: elapsed {result['elapsed']:.2f}s  " +
+                  f"peak RSS {result['peak_kb'] / 1024:.0f}MB " +
+                  f"(+{(result['peak_kb'] - result['baseline_kb']) / 1024:.0f}MB)  " +
+                  f"received {result['received'] / 1024 / 1024:.0f}MB")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# -*- coding:utf-8 -*-
+"""
+Load benchmark of the webhook server: a fake Telegram sender posting
+updates over keep-alive connections like the Bot API does.
+
+python webhook_bench.py --url http://127.0.0.1:8443/bot<key> --secret <secret_token>
+"""
+import ssl
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+
+from urllib.parse import urlparse
+
+
+def make_update(update_id):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": -1000000000000 - update_id % 50, "type": "supergroup", "title": "bench"},
+            "from": {"id": 1000 + update_id % 500, "is_bot": False, "first_name": "bench"},
+            "text": "/bench " + str(update_id)
+        }
+    }
+
+
+def sender(url, secret, update_ids, latencies, errors):
+    if url.scheme == "https":
+        conn = http.client.HTTPSConnection(url.hostname, url.port,
+            context=ssl._create_unverified_context())
+    else:
+        conn = http.client.HTTPConnection(url.hostname, url.port)
+    headers = {
+        "Content-Type": "application/json",
+        "X-Telegram-Bot-Api-Secret-Token": secret
+    }
+
+    for update_id in update_ids:
+        body = json.dumps(make_update(update_id)).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            conn.request("POST", url.path, body=body, headers=headers)
+            res = conn.getresponse()
+            res.read()
+            if res.status != 200:
+                errors.append(res.status)
+        except Exception as e:
+            errors.append(str(e))
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="teelebot webhook load benchmark")
+    parser.add_argument("--url", required=True, help="webhook url, e.g. http://127.0.0.1:8443/bot<key>")
+    parser.add_argument("--secret", default="", help="secret_token of the bot")
+    parser.add_argument("--updates", type=int, default=5000, help="number of updates to send")
+    parser.add_argument("--connections", type=int, default=40, help="concurrent connections, like max_connections")
+    parser.add_argument("--start", type=int, default=1, help="first update_id")
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    latencies, errors = [], []
+    threads = []
+    update_ids = list(range(args.start, args.start + args.updates))
+    for i in range(args.connections):
+        t = threading.Thread(target=sender,
+            args=(url, args.secret, update_ids[i::args.connections], latencies, errors))
+        threads.append(t)
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"updates: {args.updates}  connections: {args.connections}  errors: {len(errors)}")
+    print(f"elapsed: {elapsed:.2f}s  throughput: {len(latencies) / elapsed:.0f} updates/s")
+    print(f"latency: p50 {percentile(0.50):.2f}ms  p95 {percentile(0.95):.2f}ms  " +
+          f"p99 {percentile(0.99):.2f}ms  max {percentile(1):.2f}ms")
+    if errors:
+        print("first errors:", errors[:5])
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()